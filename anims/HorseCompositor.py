@@ -0,0 +1,146 @@
+import pygame
+import random
+import glob
+import sys
+import os
+from collections import OrderedDict
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from anims.SpriteCache import sprite_cache
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COAT_DIR = os.path.join(PROJECT_ROOT, "Assets", "Horses")
+CUSTOMIZATION_DIR = os.path.join(PROJECT_ROOT, "Assets", "Horse Pack", "Customization")
+MANE_STYLES = ["Long Hair", "Short Hair"]
+MARKING_STYLE = "Face Markings"
+
+# Layer sheet layout (Horse Pack): 64x48 frames, 4 rows (one per direction) per animation
+LAYER_FRAME_WIDTH = 64
+LAYER_FRAME_HEIGHT = 48
+IDLE_RIGHT_ROW = 1
+IDLE_FRAME_COUNT = 3
+RUN_RIGHT_ROW = 13
+RUN_FRAME_COUNT = 6
+
+# (row, frame count) of every animation a horse needs from a layer sheet: idle, run
+LAYER_ROWS = ((IDLE_RIGHT_ROW, IDLE_FRAME_COUNT), (RUN_RIGHT_ROW, RUN_FRAME_COUNT))
+
+# Chance that a generated horse has no face marking
+NO_MARKING_CHANCE = 0.3
+# Composited animations kept around (one entry per unique layer combination and size).
+# There are far more combinations than this; a miss only stacks already cut layers (well under 1 ms),
+# the expensive part (decoding the layer sheets) is cached per layer in the sprite cache.
+COMPOSITE_CACHE_SIZE = 64
+
+
+def _layer_files(directory):
+    # Numeric order (1, 2, ..., 10) instead of string order
+    paths = glob.glob(os.path.join(directory, "*.png"))
+    return sorted(paths, key=lambda path: (len(os.path.basename(path)), os.path.basename(path)))
+
+
+# HorseCompositor - builds custom horses by stacking coat, marking and mane layers.
+# An appearance is a tuple of layer paths (coat, marking or None, mane).
+# Layer rows come from the sprite cache already cut and scaled like the color strips
+# (straight from the atlas when it has them), and every unique appearance is composited
+# once into ordinary frame lists, so drawing a custom horse is still one blit per frame.
+class HorseCompositor:
+    def __init__(self, cache_size=COMPOSITE_CACHE_SIZE):
+        self.cache_size = cache_size
+        self.composites = OrderedDict() # (appearance, width, height) -> (idle frames, run frames)
+        self.hits = 0
+        self.misses = 0
+        self.coats = _layer_files(COAT_DIR)
+        self.markings = _layer_files(os.path.join(CUSTOMIZATION_DIR, MARKING_STYLE))
+        self.manes = [path for style in MANE_STYLES for path in _layer_files(os.path.join(CUSTOMIZATION_DIR, style))]
+
+    # Whether the layer art is there at all
+    def is_available(self):
+        return bool(self.coats and self.manes)
+
+    def layer_paths(self):
+        return self.coats + self.markings + self.manes
+
+    # Sprite cache keys of one layer's (idle, run) rows at a sprite size
+    @staticmethod
+    def layer_cache_keys(path, scale_width, scale_height):
+        return [(path, LAYER_FRAME_WIDTH, LAYER_FRAME_HEIGHT, num_frames, scale_width, scale_height, row)
+                for row, num_frames in LAYER_ROWS]
+
+    # Cut every layer ahead of time, like Horse.preload_sprites: rows the atlas doesn't have
+    # are decoded on the asset loader (one decode per sheet). Returns the keys to wait for.
+    def preload_layers(self, scale_width, scale_height, asset_manager):
+        keys = []
+        for path in self.layer_paths():
+            entries = [entry for entry in self.layer_cache_keys(path, scale_width, scale_height)
+                       if not sprite_cache.load_from_atlas(entry)]
+            if not entries:
+                continue
+            key = ("layer", path, scale_width, scale_height)
+            asset_manager.load(
+                key,
+                lambda path=path: pygame.image.load(path),
+                lambda image, entries=entries: [sprite_cache.add_sheet(entry, image) for entry in entries]
+            )
+            keys.append(key)
+        return keys
+
+    # Pick a random coat, mane and (maybe) face marking
+    def random_appearance(self, rng=random):
+        coat = rng.choice(self.coats)
+        mane = rng.choice(self.manes)
+        marking = None
+        if self.markings and rng.random() >= NO_MARKING_CHANCE:
+            marking = rng.choice(self.markings)
+        return (coat, marking, mane)
+
+    # (idle frames, run frames) for an appearance, compositing them on first use
+    def get_animation_frames(self, appearance, scale_width, scale_height):
+        key = (tuple(appearance), scale_width, scale_height)
+        frames = self.composites.get(key)
+        if frames is not None:
+            self.hits += 1
+            self.composites.move_to_end(key)
+        else:
+            self.misses += 1
+            frames = self._composite(appearance, scale_width, scale_height)
+            self.composites[key] = frames
+            # Least recently used combination goes first; horses still using it keep their frames
+            while len(self.composites) > self.cache_size:
+                self.composites.popitem(last=False)
+        # Callers get their own lists, the Surfaces themselves are shared
+        return list(frames[0]), list(frames[1])
+
+    # Stack the already scaled layers frame by frame (bottom to top).
+    # Scaling each layer like a strip frame and then stacking gives the same pixels as
+    # stacking at source size and scaling once, and keeps custom horses at the strips' scale.
+    def _composite(self, appearance, scale_width, scale_height):
+        layers = [[sprite_cache.get_animation_row(*key) for key in self.layer_cache_keys(path, scale_width, scale_height)]
+                  for path in appearance if path]
+        animations = []
+        for animation_index in range(len(LAYER_ROWS)):
+            frames = []
+            for frame_index in range(len(layers[0][animation_index])):
+                # The coat is copied rather than blended onto an empty frame
+                image = layers[0][animation_index][frame_index].copy()
+                for layer in layers[1:]:
+                    image.blit(layer[animation_index][frame_index], (0, 0))
+                frames.append(image)
+            animations.append(frames)
+        return animations[0], animations[1]
+
+    # Drop every composited animation (cut layers live in the sprite cache)
+    def clear(self):
+        self.composites.clear()
+
+    def __contains__(self, key):
+        return key in self.composites
+
+    def __len__(self):
+        return len(self.composites)
+
+
+# Shared instance used by the game
+horse_compositor = HorseCompositor()
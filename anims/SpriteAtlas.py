@@ -0,0 +1,133 @@
+import pygame
+import json
+import glob
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ASSETS_DIR = os.path.join(PROJECT_ROOT, "Assets")
+ATLAS_DIR = os.path.join(ASSETS_DIR, "atlas")
+# Horse strips that go into the atlas
+ATLAS_SOURCES = "horses_*.png"
+
+
+def atlas_index_path(frame_width, frame_height):
+    return os.path.join(ATLAS_DIR, f"horses_{frame_width}x{frame_height}.json")
+
+
+# Custom horse layers share file names (1.png, 2.png, ...), so they are keyed by their path under Assets
+def atlas_layer_name(path):
+    return os.path.relpath(path, ASSETS_DIR).replace(os.sep, "/")
+
+
+# SpriteAtlas - every horse frame, already scaled, packed into one image.
+# Loading it is a single PNG decode; frames are subsurface views into it.
+# Holds the color strips (whole sheet, one row) and the rows of the custom horse layers.
+class SpriteAtlas:
+    def __init__(self, index_path):
+        with open(index_path) as index_file:
+            self.index = json.load(index_file)
+        image_path = os.path.join(os.path.dirname(index_path), self.index["image"])
+        # Use convert_alpha for transparency
+        self.image = pygame.image.load(image_path).convert_alpha()
+        self.frame_width = self.index["frame_width"]
+        self.frame_height = self.index["frame_height"]
+        self.source_frame_width = self.index["source_frame_width"]
+        self.source_frame_height = self.index["source_frame_height"]
+
+    # Frames for one strip or layer row, or None if the atlas can't serve this request
+    def get_animation_row(self, path, frame_width, frame_height, num_frames, scale_width, scale_height, row_index=0):
+        if (scale_width, scale_height) != (self.frame_width, self.frame_height):
+            return None
+        strip = self._find_row(path, frame_width, frame_height, row_index)
+        if strip is None or num_frames > strip["frames"]:
+            return None
+        return [
+            self.image.subsurface((strip["x"] + i * self.frame_width, strip["y"], self.frame_width, self.frame_height))
+            for i in range(num_frames)
+        ]
+
+    # Where a row of a sheet was packed (None if it wasn't, or was cut with another frame size)
+    def _find_row(self, path, frame_width, frame_height, row_index):
+        if row_index == 0 and (frame_width, frame_height) == (self.source_frame_width, self.source_frame_height):
+            strip = self.index["strips"].get(os.path.basename(path))
+            if strip is not None:
+                return strip
+        if (frame_width, frame_height) == (self.index.get("layer_frame_width"), self.index.get("layer_frame_height")):
+            return self.index.get("layers", {}).get(atlas_layer_name(path), {}).get(str(row_index))
+        return None
+
+
+# Cut one row of a sheet and scale its frames (same steps as SpriteSheet.get_image)
+def _scaled_row(sheet, source_frame_width, source_frame_height, row_index, num_frames, frame_width, frame_height):
+    frames = []
+    for i in range(num_frames):
+        image = pygame.Surface((source_frame_width, source_frame_height), pygame.SRCALPHA)
+        image.blit(sheet, (0, 0), (i * source_frame_width, row_index * source_frame_height,
+                                   source_frame_width, source_frame_height))
+        frames.append(pygame.transform.scale(image, (frame_width, frame_height)))
+    return frames
+
+
+# Offline build step: cut and scale every strip and custom horse layer row and pack
+# them one row per atlas row into Assets/atlas/horses_<w>x<h>.png + .json.
+# layers: {layer path: [(row index, frame count), ...]}, cut at layer_frame_size
+def build_atlas(frame_width, frame_height, source_frame_width, source_frame_height, sources=None,
+                layers=None, layer_frame_size=None):
+    sources = sources or sorted(glob.glob(os.path.join(PROJECT_ROOT, "Assets", ATLAS_SOURCES)))
+    layers = layers or {}
+    rows = []  # (strip name or (layer name, row index), frames)
+    for path in sources:
+        sheet = pygame.image.load(path)
+        rows.append((os.path.basename(path), _scaled_row(sheet, source_frame_width, source_frame_height, 0,
+                                                         sheet.get_width() // source_frame_width, frame_width, frame_height)))
+    for path, layer_rows in layers.items():
+        sheet = pygame.image.load(path)
+        for row_index, num_frames in layer_rows:
+            rows.append(((atlas_layer_name(path), row_index),
+                         _scaled_row(sheet, *layer_frame_size, row_index, num_frames, frame_width, frame_height)))
+    columns = max(len(frames) for _, frames in rows)
+    atlas = pygame.Surface((columns * frame_width, len(rows) * frame_height), pygame.SRCALPHA)
+
+    strips = {}
+    layer_index = {}
+    for row, (name, frames) in enumerate(rows):
+        y = row * frame_height
+        for i, image in enumerate(frames):
+            atlas.blit(image, (i * frame_width, y))
+        entry = {"x": 0, "y": y, "frames": len(frames)}
+        if isinstance(name, tuple):
+            layer_index.setdefault(name[0], {})[str(name[1])] = entry
+        else:
+            strips[name] = entry
+
+    index_path = atlas_index_path(frame_width, frame_height)
+    image_name = os.path.splitext(os.path.basename(index_path))[0] + ".png"
+    os.makedirs(ATLAS_DIR, exist_ok=True)
+    pygame.image.save(atlas, os.path.join(ATLAS_DIR, image_name))
+    with open(index_path, "w") as index_file:
+        json.dump({
+            "image": image_name,
+            "frame_width": frame_width,
+            "frame_height": frame_height,
+            "source_frame_width": source_frame_width,
+            "source_frame_height": source_frame_height,
+            "strips": strips,
+            "layer_frame_width": layer_frame_size[0] if layers else None,
+            "layer_frame_height": layer_frame_size[1] if layers else None,
+            "layers": layer_index,
+        }, index_file, indent=2)
+    return index_path
+
+
+if __name__ == "__main__":
+    from core.Settings import HORSE_SPRITE_WIDTH, HORSE_SPRITE_HEIGHT
+    from core.Horse import SPRITE_FRAME_WIDTH, SPRITE_FRAME_HEIGHT
+    from anims.HorseCompositor import horse_compositor, LAYER_ROWS, LAYER_FRAME_WIDTH, LAYER_FRAME_HEIGHT
+    index_path = build_atlas(HORSE_SPRITE_WIDTH, HORSE_SPRITE_HEIGHT, SPRITE_FRAME_WIDTH, SPRITE_FRAME_HEIGHT,
+                             layers={path: LAYER_ROWS for path in horse_compositor.layer_paths()},
+                             layer_frame_size=(LAYER_FRAME_WIDTH, LAYER_FRAME_HEIGHT))
+    print(f"Wrote {index_path}")
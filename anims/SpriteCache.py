@@ -0,0 +1,90 @@
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from anims.SpriteSheet import SpriteSheet
+from anims.SpriteAtlas import SpriteAtlas
+
+
+# Process-wide cache of cut and scaled animation frames.
+# Keyed by (path, frame size, num frames, scale size, row) so every Horse that
+# uses the same strip shares one list of frames instead of decoding the PNG again.
+class SpriteCache:
+    def __init__(self):
+        self.frames = {}
+        self.hits = 0
+        self.misses = 0
+        # Packed atlas of pre-scaled frames (see anims/SpriteAtlas.py), if one is loaded
+        self.atlas = None
+
+    # Get frames for one animation row, loading and scaling them on first use
+    def get_animation_row(self, path, frame_width, frame_height, num_frames, scale_width, scale_height, row_index=0):
+        key = (path, frame_width, frame_height, num_frames, scale_width, scale_height, row_index)
+        frames = self.frames.get(key)
+        if frames is None:
+            self.misses += 1
+            if not self.load_from_atlas(key):
+                sheet = SpriteSheet(path)
+                self.frames[key] = sheet.get_animation_row(frame_width, frame_height, num_frames, scale_width, scale_height, row_index)
+            frames = self.frames[key]
+        else:
+            self.hits += 1
+        # Callers get their own list, the Surfaces themselves are shared
+        return list(frames)
+
+    # Use a packed atlas for every request it can serve; returns False if there is none
+    def load_atlas(self, index_path):
+        if not os.path.exists(index_path):
+            return False
+        try:
+            self.atlas = SpriteAtlas(index_path)
+            return True
+        except Exception as e:
+            print(f"Warning: Could not load sprite atlas {index_path}: {e}")
+            return False
+
+    # Store frames for key straight from the atlas (no decoding); False if it doesn't have them
+    def load_from_atlas(self, key):
+        if key in self.frames:
+            return True
+        if self.atlas is None:
+            return False
+        frames = self.atlas.get_animation_row(*key)
+        if frames is None:
+            return False
+        self.frames[key] = frames
+        return True
+
+    # Cut and store frames from an already decoded sheet image
+    def add_sheet(self, key, image):
+        sheet = SpriteSheet(key[0], image)
+        self.frames[key] = sheet.get_animation_row(*key[1:])
+        return self.frames[key]
+
+    # Load a batch of rows up front, e.g. before the first race
+    # Each entry: (path, frame_width, frame_height, num_frames, scale_width, scale_height, row_index)
+    def preload(self, entries):
+        for entry in entries:
+            key = tuple(entry)
+            if key not in self.frames:
+                self.get_animation_row(*key)
+
+    # Drop cached frames for one sheet (all sizes/rows) or everything
+    def evict(self, path=None):
+        if path is None:
+            self.frames.clear()
+            return
+        for key in [key for key in self.frames if key[0] == path]:
+            del self.frames[key]
+
+    def __contains__(self, key):
+        return key in self.frames
+
+    def __len__(self):
+        return len(self.frames)
+
+
+# Shared instance used by the game
+sprite_cache = SpriteCache()
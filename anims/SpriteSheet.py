@@ -2,10 +2,13 @@ import pygame
 
 # SpriteSheet loader - cuts up sprite images into frames
 class SpriteSheet:
-    def __init__(self, filename):
+    # image: already decoded sheet (e.g. from the AssetManager), loaded from filename if None
+    def __init__(self, filename, image=None):
         try:
+            if image is None:
+                image = pygame.image.load(filename)
             # Use convert_alpha for transparency
-            self.sheet = pygame.image.load(filename).convert_alpha() 
+            self.sheet = image.convert_alpha() 
         except pygame.error as e:
             print(f"Unable to load spritesheet image: {filename}")
             raise SystemExit(e)
@@ -0,0 +1,89 @@
+import pygame
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Decoder threads (file I/O and PNG/MP3/WAV decoding release the GIL)
+ASSET_LOADER_THREADS = 4
+
+
+# AssetManager - loads images and sounds on a thread pool.
+# Decoding happens on worker threads; anything that needs the display
+# (convert/convert_alpha/scale) is finished on the main thread in poll().
+# Every failure is recorded once here instead of in scattered try/excepts.
+class AssetManager:
+    def __init__(self, max_workers=ASSET_LOADER_THREADS):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="assets")
+        self.assets = {}    # key -> finished asset (None if it failed)
+        self.pending = {}   # key -> (future, finalize)
+        self.failures = {}  # key -> error message
+        self.requested = 0
+        self.finished = 0
+
+    # Queue a load. load_fn runs on a worker thread, finalize(result) on the main thread.
+    def load(self, key, load_fn, finalize=None):
+        if key in self.assets or key in self.pending:
+            return
+        self.requested += 1
+        self.pending[key] = (self.executor.submit(load_fn), finalize)
+
+    # Image file, optionally converted for the display and scaled to size
+    def load_image(self, key, path, alpha=False, size=None):
+        def finalize(image):
+            image = image.convert_alpha() if alpha else image.convert()
+            if size:
+                image = pygame.transform.scale(image, size)
+            return image
+        self.load(key, lambda: pygame.image.load(path), finalize)
+
+    # Finish whatever the workers are done with; call once per frame.
+    # Returns the number of assets completed by this call.
+    def poll(self, on_progress=None):
+        done_keys = [key for key, (future, _) in self.pending.items() if future.done()]
+        for key in done_keys:
+            future, finalize = self.pending.pop(key)
+            try:
+                asset = future.result()
+                if finalize:
+                    asset = finalize(asset)
+                self.assets[key] = asset
+            except Exception as e:
+                self.record_failure(key, e)
+            self.finished += 1
+        if done_keys and on_progress:
+            on_progress(*self.progress())
+        return len(done_keys)
+
+    # Block until the given keys (or everything) are loaded, reporting progress
+    def wait(self, keys=None, on_progress=None):
+        if on_progress:
+            on_progress(*self.progress())
+        while True:
+            self.poll(on_progress)
+            waiting = [self.pending[key][0] for key in (self.pending if keys is None else keys) if key in self.pending]
+            if not waiting:
+                return
+            wait(waiting, return_when=FIRST_COMPLETED)
+
+    # Mark an asset as missing (reported once, never retried)
+    def record_failure(self, key, error):
+        if key not in self.failures:
+            print(f"Warning: Could not load asset {key}: {error}")
+        self.failures[key] = str(error)
+        self.assets[key] = None
+
+    def get(self, key, default=None):
+        asset = self.assets.get(key)
+        return default if asset is None else asset
+
+    def is_ready(self, keys):
+        return all(key in self.assets for key in keys)
+
+    def is_loading(self):
+        return bool(self.pending)
+
+    # (finished, requested) counts for a loading bar
+    def progress(self):
+        return self.finished, self.requested
+
+
+# Shared instance used by the game
+asset_manager = AssetManager()
@@ -0,0 +1,257 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+# Benchmarks always run headless (SDL dummy drivers) unless told otherwise
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import GameManager as game_module
+from core.GameManager import GameManager
+from core.Renderer import Renderer
+from core.CampaignRunner import CampaignRunner
+from core.AssetManager import asset_manager
+from core.Horse import SPRITE_FRAME_WIDTH, SPRITE_FRAME_HEIGHT, RUN_FRAME_COUNT
+from anims.SpriteSheet import SpriteSheet
+from anims.SpriteCache import sprite_cache
+from anims.SpriteAtlas import atlas_index_path
+from anims.HorseCompositor import horse_compositor
+from core.Settings import SCREEN_WIDTH, SCREEN_HEIGHT, RACE_HEIGHT, UI_HEIGHT, HORSE_SPRITE_WIDTH, HORSE_SPRITE_HEIGHT
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARK_DIR = os.path.join(PROJECT_ROOT, "benchmarks")
+BASELINE_FILE = os.path.join(BENCHMARK_DIR, "baseline.json")
+RESULTS_FILE = os.path.join(BENCHMARK_DIR, "latest.json")
+# A metric regresses when it is this much worse than the baseline
+DEFAULT_TOLERANCE = 0.25
+# Per metric: the run-to-run spread of its median on one machine and unchanged code, plus margin.
+# Sub-millisecond latencies and pure-Python loops swing far more than the big blits.
+METRIC_TOLERANCES = {
+    "render_full_fps": 0.20,
+    "render_dirty_fps": 0.25,
+    "update_race_tps": 0.35,
+    "create_horses_cold_ms": 0.35,
+    "create_horses_warm_ms": 0.50, # ~0.4 ms of small allocations; its median drifts with the machine
+    "sprite_sheet_row_ms": 0.35,
+    "campaigns_per_s": 0.40,
+}
+# Every benchmark runs this many rounds and reports the median one
+# (steadier across runs than the best, which rewards one lucky round)
+ROUNDS = 7
+BENCHMARK_SEED = 1234
+
+
+# Median of `rounds` calls to fn, each returning (work units, seconds)
+def _median_rate(fn, rounds):
+    return statistics.median(units / seconds for units, seconds in (fn() for _ in range(rounds)))
+
+
+# Median of `rounds` rounds; each round is the median of `calls` calls, in ms
+def _median_ms(fn, rounds, calls):
+    round_ms = []
+    for _ in range(rounds):
+        times = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            fn()
+            times.append((time.perf_counter() - start) * 1000)
+        round_ms.append(statistics.median(times))
+    return statistics.median(round_ms)
+
+
+# Get the game back to a state where a race can start
+def _ready_for_race(game_manager):
+    if game_manager.game_state == "GAME_OVER":
+        game_manager.full_game_reset()
+    elif game_manager.game_state == "POST_RACE":
+        game_manager.reset_for_next_race()
+    game_manager.set_bet(25)
+    game_manager.start_race()
+
+
+# Renderer.draw_game_state frames per second over whole races (betting screen + race)
+def bench_render(screen, game_manager, dirty_rect_mode, frames=600):
+    renderer = Renderer(screen, SCREEN_WIDTH, RACE_HEIGHT, UI_HEIGHT, dirty_rect_mode)
+    game_manager.renderer = renderer
+
+    def run():
+        drawn = 0
+        elapsed = 0.0
+        while drawn < frames:
+            if game_manager.game_state != "RACING":
+                _ready_for_race(game_manager)
+            game_manager.update_race()
+            start = time.perf_counter()
+            renderer.draw_game_state(game_manager)
+            elapsed += time.perf_counter() - start
+            drawn += 1
+        return drawn, elapsed
+    return run
+
+
+# GameManager.update_race ticks per second (live simulation, animation included)
+def bench_update_race(game_manager, races=20):
+    def run():
+        ticks = 0
+        elapsed = 0.0
+        for _ in range(races):
+            _ready_for_race(game_manager)
+            start = time.perf_counter()
+            while game_manager.game_state == "RACING":
+                game_manager.update_race()
+                ticks += 1
+            elapsed += time.perf_counter() - start
+        return ticks, elapsed
+    return run
+
+
+# _create_horses with empty sprite caches (cold: the atlas is unloaded too and its
+# decode is part of the timing) and with everything cached (warm)
+def bench_create_horses(game_manager, cold):
+    def run():
+        if cold:
+            sprite_cache.evict()
+            sprite_cache.atlas = None
+            horse_compositor.clear()
+            sprite_cache.load_atlas(atlas_index_path(HORSE_SPRITE_WIDTH, HORSE_SPRITE_HEIGHT))
+        # Same day RNG every time, so warm runs really reuse the same sprites
+        game_manager.rng = game_manager.make_day_rng(1)
+        game_manager._create_horses()
+    return run
+
+
+# SpriteSheet.get_animation_row on an already decoded strip (cut + scale only)
+def bench_sprite_sheet_row():
+    sheet = SpriteSheet(os.path.join(PROJECT_ROOT, "Assets", "horses_run_right_brown.png"))
+
+    def run():
+        sheet.get_animation_row(SPRITE_FRAME_WIDTH, SPRITE_FRAME_HEIGHT, RUN_FRAME_COUNT,
+                                HORSE_SPRITE_WIDTH, HORSE_SPRITE_HEIGHT)
+    return run
+
+
+# Whole headless campaigns per second on one process
+def bench_campaigns(campaigns=500):
+    runner = CampaignRunner("quarter")
+
+    def run():
+        start = time.perf_counter()
+        runner.run_batch(campaigns, seed=BENCHMARK_SEED)
+        return campaigns, time.perf_counter() - start
+    return run
+
+
+# Run everything; returns {name: {"value", "unit", "higher_is_better"}}
+def run_benchmarks(rounds=ROUNDS):
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    # Live races so update_race does the real per-tick work
+    game_module.PRECOMPUTED_RACES = False
+    game_manager = GameManager(screen, seed=BENCHMARK_SEED)
+    # Time the real backgrounds and sounds, not the placeholders shown while they load
+    asset_manager.wait()
+    game_manager._poll_assets()
+
+    results = {}
+
+    def rate(name, unit, fn):
+        results[name] = {"value": _median_rate(fn, rounds), "unit": unit, "higher_is_better": True}
+        print(f"  {name:<28} {results[name]['value']:12.2f} {unit}")
+
+    def latency(name, fn, calls=10):
+        fn() # warm up imports and lazily created state
+        results[name] = {"value": _median_ms(fn, rounds, calls), "unit": "ms", "higher_is_better": False}
+        print(f"  {name:<28} {results[name]['value']:12.3f} ms")
+
+    rate("render_full_fps", "frames/s", bench_render(screen, game_manager, False))
+    rate("render_dirty_fps", "frames/s", bench_render(screen, game_manager, True))
+    rate("update_race_tps", "ticks/s", bench_update_race(game_manager))
+    latency("create_horses_cold_ms", bench_create_horses(game_manager, cold=True), calls=25)
+    latency("create_horses_warm_ms", bench_create_horses(game_manager, cold=False), calls=200)
+    latency("sprite_sheet_row_ms", bench_sprite_sheet_row(), calls=50)
+    rate("campaigns_per_s", "campaigns/s", bench_campaigns())
+    return results
+
+
+def save_results(results, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as results_file:
+        json.dump({
+            "meta": {
+                "python": platform.python_version(),
+                "pygame": pygame.version.ver,
+                "machine": platform.machine(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+            },
+            "results": results,
+        }, results_file, indent=2)
+
+
+# Compare against a baseline; returns the names of metrics that got worse than tolerance allows.
+# tolerance applies to every metric; None uses METRIC_TOLERANCES (DEFAULT_TOLERANCE for the rest).
+def compare_results(results, baseline, tolerance=None):
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or not base["value"]:
+            print(f"  {name:<28} (no baseline)")
+            continue
+        allowed = tolerance if tolerance is not None else METRIC_TOLERANCES.get(name, DEFAULT_TOLERANCE)
+        # Positive change = better (speedup for rates, time saved for latencies)
+        if result["higher_is_better"]:
+            change = result["value"] / base["value"] - 1.0
+        else:
+            change = base["value"] / result["value"] - 1.0
+        status = "ok"
+        if change < -allowed:
+            status = "REGRESSION"
+            regressions.append(name)
+        elif change > allowed:
+            status = "faster"
+        print(f"  {name:<28} {change * 100:+7.1f}%  {status} (tolerance {allowed * 100:.0f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless benchmarks for rendering, race simulation and asset loading.")
+    parser.add_argument("--rounds", type=int, default=ROUNDS)
+    parser.add_argument("--output", default=RESULTS_FILE)
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help="Allowed slowdown for every metric (default: per metric, see METRIC_TOLERANCES)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    args = parser.parse_args()
+
+    print(f"Benchmarks (median of {args.rounds} rounds)")
+    results = run_benchmarks(args.rounds)
+    save_results(results, args.output)
+
+    if args.save_baseline:
+        save_results(results, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline} (run with --save-baseline)")
+        return
+
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)["results"]
+    print("Compared to baseline")
+    regressions = compare_results(results, baseline, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+import argparse
+import numpy as np
+import random
+import sys
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.Weather import Weather, PERFORMANCE_MODIFIERS
+from core.OddsTable import odds_table
+from core.HorseStats import (
+    multipliers_from_probabilities, STAT_MIN, STAT_MAX, HOUSE_EDGE, PRICED_MULTIPLIER_MIN, PRICED_MULTIPLIER_MAX
+)
+from core.Settings import (
+    STARTING_CASH, DEBT_TO_PAY, DAY_LIMIT, BET_PERCENTAGES, MIN_HORSES, MAX_HORSES, WEATHER_TYPES
+)
+
+OUTCOMES = ("PAID", "FAILED", "BANKRUPT")
+
+
+# One day's field for every campaign in a batch, as (campaigns, MAX_HORSES) arrays.
+# Slots past a field's size are empty (present False, win_probability 0).
+class FieldBatch:
+    def __init__(self, present, speeds, staminas, weather_preferences, win_probability, multiplier):
+        self.present = present
+        self.size = present.sum(axis=1)
+        self.speeds = speeds
+        self.staminas = staminas
+        # Index into WEATHER_TYPES
+        self.weather_preferences = weather_preferences
+        # What the game shows as CHANCES (exact win probability, 0.0 - 1.0)
+        self.win_probability = win_probability
+        self.multiplier = multiplier
+
+
+#  Betting policies
+# A policy gets the day's FieldBatch, every campaign's cash and the batch's seeded policy
+# RNG (a numpy Generator), and returns (horse index, bet percent) arrays, one entry per campaign.
+# The game forces a bet every day, so a policy can't skip a race.
+
+# Always 25% on the horse with the best displayed chance
+def bet_quarter_on_favorite(fields, cash, rng):
+    return _favorite(fields), np.full(len(cash), 25)
+
+
+# Always 100% on the favorite
+def bet_all_on_favorite(fields, cash, rng):
+    return _favorite(fields), np.full(len(cash), 100)
+
+
+# 25% on the horse that pays the most
+def bet_max_multiplier(fields, cash, rng):
+    return np.where(fields.present, fields.multiplier, -np.inf).argmax(axis=1), np.full(len(cash), 25)
+
+
+# Kelly criterion on the best edge, rounded down to the available bet buttons
+def bet_kelly(fields, cash, rng):
+    p = fields.win_probability
+    fractions = np.where(fields.present, p - (1.0 - p) / fields.multiplier, -np.inf)
+    best_index = fractions.argmax(axis=1)
+    best_fraction = np.take_along_axis(fractions, best_index[:, None], axis=1)[:, 0]
+    percents = np.sort(BET_PERCENTAGES)
+    allowed = np.searchsorted(percents, best_fraction * 100, side="right")
+    return best_index, percents[np.maximum(allowed - 1, 0)]
+
+
+# Uniformly random horse and bet size
+def bet_random(fields, cash, rng):
+    return rng.integers(fields.size), rng.choice(BET_PERCENTAGES, size=len(cash))
+
+
+def _favorite(fields):
+    return np.where(fields.present, fields.win_probability, -1.0).argmax(axis=1)
+
+
+POLICIES = {
+    "quarter": bet_quarter_on_favorite,
+    "all_in": bet_all_on_favorite,
+    "max_multiplier": bet_max_multiplier,
+    "kelly": bet_kelly,
+    "random": bet_random,
+}
+
+
+# PERFORMANCE_MODIFIERS index for [current weather][horse's preference], from Weather itself
+def _weather_modifier_indices():
+    weather = Weather(random.Random(0))
+    indices = np.empty((len(WEATHER_TYPES), len(WEATHER_TYPES)), dtype=np.int64)
+    for i, current in enumerate(WEATHER_TYPES):
+        weather.current_weather = current
+        for j, preference in enumerate(WEATHER_TYPES):
+            indices[i, j] = PERFORMANCE_MODIFIERS.index(weather.get_performance_modifier(preference))
+    return indices
+
+
+# Plays whole DAY_LIMIT-day campaigns with the same rules as GameManager and Wallet, without pygame.
+# A batch of campaigns is played side by side, one day at a time, as NumPy arrays: fields are
+# priced from the odds table and each race's winner is drawn from the same finishing-tick
+# distributions, so a day costs a few array passes for the whole batch instead of a
+# Python loop per horse.
+class CampaignRunner:
+    def __init__(self, policy=bet_quarter_on_favorite, starting_cash=STARTING_CASH, debt_to_pay=DEBT_TO_PAY,
+                 day_limit=DAY_LIMIT, house_edge=HOUSE_EDGE,
+                 multiplier_min=PRICED_MULTIPLIER_MIN, multiplier_max=PRICED_MULTIPLIER_MAX):
+        self.policy = POLICIES[policy] if isinstance(policy, str) else policy
+        self.starting_cash = starting_cash
+        self.debt_to_pay = debt_to_pay
+        self.day_limit = day_limit
+        self.house_edge = house_edge
+        self.multiplier_min = multiplier_min
+        self.multiplier_max = multiplier_max
+        self.weather_modifier_indices = _weather_modifier_indices()
+        _ensure_odds_table()
+
+    # Roll every campaign's field for the day with the distributions GameManager._create_horses
+    # uses (field size, weather preference and stats, all uniform). Only the distributions match:
+    # the game also draws sprites, names and colors from its per-day RNG, so a seed here doesn't
+    # reproduce the game's fields.
+    def roll_fields(self, rng, weather):
+        count = len(weather)
+        sizes = rng.integers(MIN_HORSES, MAX_HORSES + 1, size=count)
+        present = np.arange(MAX_HORSES) < sizes[:, None]
+        weather_preferences = rng.integers(len(WEATHER_TYPES), size=(count, MAX_HORSES))
+        speeds = rng.integers(STAT_MIN, STAT_MAX + 1, size=(count, MAX_HORSES))
+        staminas = rng.integers(STAT_MIN, STAT_MAX + 1, size=(count, MAX_HORSES))
+        modifier_indices = self.weather_modifier_indices[weather[:, None], weather_preferences]
+        classes = odds_table.field_classes(speeds, staminas, modifier_indices)
+        # Priced from the odds table, like Horse.set_win_probability
+        win_probability = odds_table.field_win_probabilities(classes, present)
+        multiplier = multipliers_from_probabilities(win_probability, self.house_edge,
+                                                    self.multiplier_min, self.multiplier_max)
+        return FieldBatch(present, speeds, staminas, weather_preferences, win_probability, multiplier), classes
+
+    # Play campaigns [first, first + count) of a seeded batch; returns per-campaign arrays
+    # (index into OUTCOMES, final cash, days played)
+    def play_batch(self, count, seed=0, first=0):
+        rng = np.random.default_rng([seed, first])
+        # Policies draw from their own stream, so every policy sees the same fields and races for a seed
+        policy_rng = np.random.default_rng([seed, first, 1])
+        cash = np.full(count, self.starting_cash, dtype=np.int64)
+        outcomes = np.full(count, -1)
+        days = np.full(count, self.day_limit)
+        weather = rng.integers(len(WEATHER_TYPES), size=count)
+        campaigns = np.arange(count)
+        for day in range(1, self.day_limit + 1):
+            active = outcomes < 0
+            fields, classes = self.roll_fields(rng, weather)
+            horse_index, percent = self.policy(fields, cash, policy_rng)
+
+            # Wallet.get_bet_percentage_amount and place_bet
+            bet = cash * percent // 100
+            bet = np.where((bet <= 0) & (cash > 0), 1, bet)
+            bet = np.minimum(bet, cash)
+            bet = np.where(active & (bet > 0), bet, 0)
+            cash -= bet
+
+            # Each horse's finishing tick, sampled from its CDF; ties go to the lower index
+            finish_ticks = odds_table.sample_finish_ticks(classes, rng.random((count, MAX_HORSES)))
+            winner = np.where(fields.present, finish_ticks, np.iinfo(np.int64).max).argmin(axis=1)
+            won = (winner == horse_index) & (bet > 0)
+            multiplier = fields.multiplier[campaigns, horse_index]
+            cash += np.where(won, np.floor(bet * multiplier).astype(np.int64) + bet, 0)
+
+            # Same end-of-day rules as GameManager.next_day
+            bankrupt = active & (cash <= 0) & (day + 1 <= self.day_limit)
+            outcomes[bankrupt] = OUTCOMES.index("BANKRUPT")
+            days[bankrupt] = day
+            if not (outcomes < 0).any():
+                break
+            weather = rng.integers(len(WEATHER_TYPES), size=count)
+
+        # Wallet.update_debt
+        debt = np.clip(self.debt_to_pay - (cash - self.starting_cash), 0, self.debt_to_pay)
+        finished = outcomes < 0
+        outcomes[finished] = np.where(debt[finished] == 0, OUTCOMES.index("PAID"), OUTCOMES.index("FAILED"))
+        return outcomes, cash, days
+
+    # Play campaigns [first, first + count) of a seeded batch and tally the outcomes
+    def run_batch(self, count, seed=0, first=0):
+        outcomes, cash, _ = self.play_batch(count, seed, first)
+        totals = {"campaigns": count, "final_cash": int(cash.sum())}
+        for i, outcome in enumerate(OUTCOMES):
+            totals[outcome] = int((outcomes == i).sum())
+        return totals
+
+
+# Build (and cache) the odds table for this distance if there isn't one yet
+def _ensure_odds_table():
+    if not odds_table.is_loaded():
+        print(f"Building the odds table for a {odds_table.distance}px race...")
+        odds_table.build()
+
+
+# Worker entry point (module level so it can be pickled)
+def _run_chunk(runner_kwargs, count, seed, first):
+    return CampaignRunner(**runner_kwargs).run_batch(count, seed, first)
+
+
+# Run many campaigns across a process pool and summarize them
+def run_campaigns(campaigns, policy="quarter", workers=None, seed=0, chunk_size=500, **runner_kwargs):
+    runner_kwargs["policy"] = policy
+    workers = workers or os.cpu_count() or 1
+    # Build the odds table once, instead of every worker racing to build it
+    _ensure_odds_table()
+    chunks = [(first, min(chunk_size, campaigns - first)) for first in range(0, campaigns, chunk_size)]
+    totals = {"campaigns": 0, "PAID": 0, "FAILED": 0, "BANKRUPT": 0, "final_cash": 0}
+    if workers == 1:
+        results = [_run_chunk(runner_kwargs, count, seed, first) for first, count in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_chunk, *zip(*[(runner_kwargs, count, seed, first) for first, count in chunks])))
+    for result in results:
+        for key in totals:
+            totals[key] += result[key]
+    count = max(1, totals["campaigns"])
+    return {
+        "campaigns": totals["campaigns"],
+        "debt_paid_rate": totals["PAID"] / count,
+        "failed_rate": totals["FAILED"] / count,
+        "bankruptcy_rate": totals["BANKRUPT"] / count,
+        "mean_final_cash": totals["final_cash"] / count,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play whole campaigns headless and report outcome rates.")
+    parser.add_argument("--campaigns", type=int, default=10000)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="quarter")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--starting-cash", type=int, default=STARTING_CASH)
+    parser.add_argument("--debt", type=int, default=DEBT_TO_PAY)
+    parser.add_argument("--days", type=int, default=DAY_LIMIT)
+    parser.add_argument("--house-edge", type=float, default=HOUSE_EDGE)
+    parser.add_argument("--multiplier-min", type=float, default=PRICED_MULTIPLIER_MIN)
+    parser.add_argument("--multiplier-max", type=float, default=PRICED_MULTIPLIER_MAX)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    report = run_campaigns(
+        args.campaigns, args.policy, args.workers, args.seed,
+        starting_cash=args.starting_cash, debt_to_pay=args.debt, day_limit=args.days,
+        house_edge=args.house_edge, multiplier_min=args.multiplier_min, multiplier_max=args.multiplier_max
+    )
+    elapsed = time.perf_counter() - start
+    print(f"Policy: {args.policy}  ({report['campaigns']} campaigns in {elapsed:.1f}s)")
+    print(f"  Debt paid:  {report['debt_paid_rate'] * 100:6.2f}%")
+    print(f"  Failed:     {report['failed_rate'] * 100:6.2f}%")
+    print(f"  Bankrupt:   {report['bankruptcy_rate'] * 100:6.2f}%")
+    print(f"  Final cash: {report['mean_final_cash']:,.0f} (mean)")
+
+
+if __name__ == "__main__":
+    main()
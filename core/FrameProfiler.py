@@ -0,0 +1,172 @@
+import pygame
+import json
+import time
+from collections import deque
+
+# Frames kept for the rolling percentiles
+PROFILER_WINDOW = 600
+# Phase spans kept for the trace file (oldest are dropped first)
+TRACE_MAX_EVENTS = 200000
+# Rebuild the overlay text every N frames (re-rendering it every frame would show up in the numbers)
+OVERLAY_REFRESH_FRAMES = 15
+OVERLAY_BG = (0, 0, 0)
+OVERLAY_FG = (50, 255, 50)
+OVERLAY_HEADER = (255, 215, 0)
+PERCENTILES = (50, 95, 99)
+
+
+# Does nothing; handed out by phase() while the profiler is off
+class _NullPhase:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+# Times one `with` block and reports it to the profiler
+class _Phase:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profiler.record(self.name, self.start, time.perf_counter_ns() - self.start)
+        return False
+
+
+# FrameProfiler - opt-in per-phase frame timing.
+# Code wraps a phase in `with frame_profiler.phase("name"):`; phases can nest and repeat,
+# their time is summed per frame. Keeps rolling p50/p95/p99 per phase, draws an overlay
+# and writes a Chrome trace (chrome://tracing, Perfetto) for offline digging.
+class FrameProfiler:
+    def __init__(self, window=PROFILER_WINDOW, max_trace_events=TRACE_MAX_EVENTS):
+        self.enabled = False
+        self.overlay_visible = False
+        self.phase_names = []    # in the order they were first seen
+        self.phase_depth = {}    # phase -> nesting depth (for the overlay)
+        self.windows = {}        # phase -> per-frame totals in ns (last `window` frames)
+        self.window = window
+        self.frame_totals = {}   # phase -> ns spent in it this frame
+        self.trace = deque(maxlen=max_trace_events)  # (phase, start ns, duration ns)
+        self.open_phases = 0
+        self.frame_start = None
+        self.frame_count = 0
+        self.overlay_surface = None
+        self.overlay_font = None
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        if not enabled:
+            self.overlay_visible = False
+        self.frame_totals.clear()
+        self.open_phases = 0
+        self.frame_start = None
+
+    # Overlay key: show the overlay (and start profiling), or hide it again
+    def toggle_overlay(self):
+        self.overlay_visible = not self.overlay_visible
+        if self.overlay_visible and not self.enabled:
+            self.set_enabled(True)
+        self.overlay_surface = None
+
+    # Context manager timing one phase (a shared no-op while disabled)
+    def phase(self, name):
+        if not self.enabled:
+            return _NULL_PHASE
+        if name not in self.phase_depth:
+            self.phase_names.append(name)
+            self.phase_depth[name] = self.open_phases
+            self.windows[name] = deque(maxlen=self.window)
+        self.open_phases += 1
+        return _Phase(self, name)
+
+    def record(self, name, start, duration):
+        self.open_phases -= 1
+        self.frame_totals[name] = self.frame_totals.get(name, 0) + duration
+        self.trace.append((name, start, duration))
+
+    def begin_frame(self):
+        if self.enabled:
+            self.frame_totals.clear()
+            self.frame_start = time.perf_counter_ns()
+
+    # Close the frame: every known phase gets a sample (0 if it didn't run)
+    def end_frame(self):
+        if not self.enabled or self.frame_start is None:
+            return
+        duration = time.perf_counter_ns() - self.frame_start
+        if "frame" not in self.windows:
+            self.phase_names.insert(0, "frame")
+            self.phase_depth["frame"] = 0
+            self.windows["frame"] = deque(maxlen=self.window)
+        self.windows["frame"].append(duration)
+        self.trace.append(("frame", self.frame_start, duration))
+        for name in self.phase_names:
+            if name != "frame":
+                self.windows[name].append(self.frame_totals.get(name, 0))
+        self.frame_totals.clear()
+        self.frame_start = None
+        self.frame_count += 1
+
+    # {phase: {"p50": ms, "p95": ms, "p99": ms}} over the rolling window
+    def get_percentiles(self):
+        stats = {}
+        for name in self.phase_names:
+            samples = sorted(self.windows[name])
+            if samples:
+                stats[name] = {
+                    f"p{p}": samples[min(len(samples) - 1, len(samples) * p // 100)] / 1e6 for p in PERCENTILES
+                }
+        return stats
+
+    # Draw the timing table in the top-left corner; returns the rect it covered
+    def draw_overlay(self, surface):
+        if not self.overlay_visible:
+            return None
+        if self.overlay_surface is None or self.frame_count % OVERLAY_REFRESH_FRAMES == 0:
+            self.overlay_surface = self._build_overlay()
+        return surface.blit(self.overlay_surface, (0, 0))
+
+    def _build_overlay(self):
+        if self.overlay_font is None:
+            self.overlay_font = pygame.font.Font(None, 18)
+        lines = [("phase            p50    p95    p99 (ms)", OVERLAY_HEADER)]
+        for name, values in self.get_percentiles().items():
+            label = "  " * self.phase_depth[name] + name
+            lines.append((f"{label:<14} {values['p50']:6.2f} {values['p95']:6.2f} {values['p99']:6.2f}", OVERLAY_FG))
+        rendered = [self.overlay_font.render(text, True, color, OVERLAY_BG) for text, color in lines]
+        width = max(image.get_width() for image in rendered) + 10
+        line_height = self.overlay_font.get_linesize()
+        overlay = pygame.Surface((width, line_height * len(rendered) + 10))
+        overlay.fill(OVERLAY_BG)
+        for i, image in enumerate(rendered):
+            overlay.blit(image, (5, 5 + i * line_height))
+        return overlay
+
+    # Write the recorded spans as a Chrome trace; returns the number of events written
+    def dump_trace(self, path):
+        events = [
+            {"name": name, "ph": "X", "ts": start / 1000, "dur": duration / 1000, "pid": 0, "tid": 0}
+            for name, start, duration in self.trace
+        ]
+        with open(path, "w") as trace_file:
+            json.dump({
+                "traceEvents": events,
+                "displayTimeUnit": "ms",
+                "otherData": {"frames": self.frame_count, "percentiles_ms": self.get_percentiles()},
+            }, trace_file)
+        return len(events)
+
+
+# Shared instance used by the game
+frame_profiler = FrameProfiler()
@@ -0,0 +1,100 @@
+import argparse
+import socket
+import pygame
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.GameManager import GameManager, FPS, ANIMATION_SPEED_MS
+from core.GameServer import SERVER_HOST, SERVER_PORT, encode_message, decode_message
+from core.Settings import SCREEN_WIDTH, SCREEN_HEIGHT
+
+RECEIVE_BUFFER = 65536
+
+
+# Non-blocking line reader/writer over the server socket
+class ServerConnection:
+    def __init__(self, host, port):
+        self.socket = socket.create_connection((host, port))
+        self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.socket.setblocking(False)
+        self.buffer = b""
+        self.closed = False
+
+    def send(self, message):
+        self.socket.setblocking(True)
+        try:
+            self.socket.sendall(encode_message(message))
+        except OSError:
+            self.closed = True
+        finally:
+            self.socket.setblocking(False)
+
+    # Every complete message received since the last call
+    def poll(self):
+        while True:
+            try:
+                data = self.socket.recv(RECEIVE_BUFFER)
+            except BlockingIOError:
+                break
+            except OSError:
+                data = b""
+            if not data:
+                self.closed = True
+                break
+            self.buffer += data
+        *lines, self.buffer = self.buffer.split(b"\n")
+        return [decode_message(line) for line in lines if line]
+
+    def close(self):
+        self.socket.close()
+
+
+# Thin kiosk client: draws a GameServer session and forwards clicks.
+# The local GameManager is only a mirror for the Renderer; it never simulates.
+def main(host=SERVER_HOST, port=SERVER_PORT):
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Horse Race Betting Tycoon")
+
+    connection = ServerConnection(host, port)
+    mirror = GameManager(screen)
+    clock = pygame.time.Clock()
+    running = True
+
+    while running and not connection.closed:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                connection.send({"type": "click", "pos": list(event.pos)})
+
+        for message in connection.poll():
+            if message["type"] == "state":
+                mirror.apply_snapshot(message["state"])
+            elif message["type"] == "positions":
+                mirror.race_state.set_positions(message["x"])
+
+        mirror._poll_assets()
+        mirror.race_state.update_animation(pygame.time.get_ticks(), ANIMATION_SPEED_MS)
+
+        dirty_rects = mirror.draw(screen)
+        if dirty_rects is None:
+            pygame.display.flip()
+        elif dirty_rects:
+            pygame.display.update(dirty_rects)
+        clock.tick(FPS)
+
+    connection.close()
+    pygame.quit()
+    sys.exit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Thin kiosk client for core.GameServer.")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    args = parser.parse_args()
+    main(args.host, args.port)
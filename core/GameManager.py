@@ -9,19 +9,26 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.Horse import Horse
 from core.Wallet import Wallet
-from core.Renderer import Renderer
-
-#Initialization
-pygame.init()
-pygame.font.init()
-
-#  Screen Settings 
-SCREEN_WIDTH = 800
-RACE_HEIGHT = 400
-UI_HEIGHT = 200
-SCREEN_HEIGHT = RACE_HEIGHT + UI_HEIGHT
-TRACK_TOP_MARGIN = 100      
-TRACK_BOTTOM_MARGIN = 400
+from core.Renderer import Renderer, ui_hit_index
+from core.RaceSimulator import RaceSimulator
+from core.RaceState import RaceState
+from core.OddsTable import odds_table
+from core.HitIndex import HitIndex
+from core.SaveGame import save_campaign_async, flush_saves, load_campaign, SaveError
+from core.RaceHistory import RaceHistory
+from core.RaceReplay import RaceRecorder, ReplayPlayer, encode_replay
+from core.Weather import Weather
+from core.AssetManager import asset_manager
+from core.SoundBank import sound_bank
+from core.FrameProfiler import frame_profiler
+from anims.SpriteCache import sprite_cache
+from anims.SpriteAtlas import atlas_index_path
+from anims.HorseCompositor import horse_compositor
+from core.Settings import (
+    SCREEN_WIDTH, RACE_HEIGHT, UI_HEIGHT, SCREEN_HEIGHT, RACE_SCREENS, TRACK_WIDTH,
+    START_LINE_X, FINISH_LINE_X, FINISH_LINE_OVERSHOOT, HORSE_SPRITE_WIDTH, HORSE_SPRITE_HEIGHT,
+    STARTING_CASH, DEBT_TO_PAY, DAY_LIMIT, MIN_HORSES, MAX_HORSES, WEATHER_TYPES, HORSE_NAMES
+)
 
 #  Colors 
 WHITE = (255, 255, 255)
@@ -39,108 +46,120 @@ STAT_BAR_FG = (200, 0, 0)
 BRIGHT_GREEN = (50, 255, 50)
 
 #  Game Constants 
-START_LINE_X = 40
-FINISH_LINE_X = SCREEN_WIDTH - 80 #yellow line thing
-HORSE_SPRITE_WIDTH = 64 
-HORSE_SPRITE_HEIGHT = 48
-STARTING_CASH = 5000 #(Maybe randomize later?) (nope)
-DEBT_TO_PAY = 10000 #how much debt to pay (should I randomize this...?) (nah)
-DAY_LIMIT = 30 # Days to pay debt 
 ANIMATION_SPEED_MS = 100
+FPS = 60 # Render rate (the simulation below does not depend on it)
+SIMULATION_HZ = 60 # Race ticks per second
+SIMULATION_STEP_MS = 1000 / SIMULATION_HZ
+MAX_SIMULATION_STEPS_PER_FRAME = 30 # Don't try to catch up more than half a second at once
+PRECOMPUTED_RACES = False # Decide the whole race at start_race and just play it back
+DIRTY_RECT_RENDERING = False # Only push changed regions to the display (for slow kiosks)
+PROFILE_FRAMES = False # Time every frame from the start (the overlay key turns it on too)
+PROFILER_OVERLAY_KEY = pygame.K_F3 # Show/hide the frame-time overlay
+TRACE_DUMP_KEY = pygame.K_F4 # Write the frame trace now
+TRACE_FILE = "frame_trace.json" # Written here (and on quit, if profiling was on)
+AUTOSAVE = True # Save the campaign after every race and resume it on the next launch
+SAVE_FILE = "campaign.sav"
+RACE_HISTORY = True # Log every race (field, bet, payout) for later analysis
+HISTORY_FILE = "race_history.db"
+RECORD_REPLAYS = True # Record every race so it can be watched again from the results screen
+REPLAY_KEY = pygame.K_r # Start/stop the replay of the last race
+REPLAY_PAUSE_KEY = pygame.K_SPACE
+REPLAY_STEP_KEYS = {pygame.K_LEFT: -1, pygame.K_RIGHT: 1} # One tick back/forward (pauses)
+REPLAY_SEEK_KEYS = {pygame.K_PAGEUP: -SIMULATION_HZ, pygame.K_PAGEDOWN: SIMULATION_HZ} # One second back/forward
+REPLAY_SPEED_KEYS = {pygame.K_1: 1, pygame.K_2: 2, pygame.K_3: 4, pygame.K_4: 8}
+CUSTOM_HORSES = True # Composite random coat/mane/marking horses instead of the flat color strips
 
 #lining
 TRACK_TOP_MARGIN = 85     # Y top line awal
 TRACK_BOTTOM_MARGIN = 250  # Y bottom line akhir
 
-#Weather Types 
-WEATHER_TYPES = ["Sunny", "Rainy"]
+# Background art per weather (falls back to the generic arena if missing)
+WEATHER_BACKGROUNDS = {
+    "Sunny": "horse_race_arena_sunny.png",
+    "Rainy": "horse_race_arena_rainy.png",
+}
+DEFAULT_BACKGROUND = "horse race arena.png"
 
-# Horse Names 
-HORSE_NAMES = [
-    "Frankfurt","Mejiro","Seabiscuit", "Black Death", "Senomy", "Nearly There",
-    "Thunderbolt", "Shadowfax", "Windrunner", "Stormchaser"
-] 
+# Sound effects (name -> file in Sounds/, SoundBank channel group)
+SOUND_FILES = {
+    "bet_low": ("select_low.wav", "ui"),
+    "bet_mid": ("select_normal.wav", "ui"),
+    "bet_high": ("select_high.wav", "ui"),
+    "click": ("clicking.wav", "ui"),
+    "horse_gallop": ("horse_galloping.mp3", "gallop"),
+    "cash_register": ("cash_register.mp3", "result"),
+    "losing_bell": ("losing_bell.wav", "result"),
+}
+BACKGROUND_MUSIC = "background_music.mp3"
+MUSIC_VOLUME = 0.4 # Lower volume for background music
 
-# Weather class - handles weather effects on horse speed
-class Weather:
-    def __init__(self):
-        self.current_weather = random.choice(WEATHER_TYPES)
-    
-    # Randomize weather for next race
-    def change_weather(self):
-        self.current_weather = random.choice(WEATHER_TYPES)
-    
-    # Returns speed boost/penalty based on weather match
-    def get_performance_modifier(self, horse_weather_preference):
-        if self.current_weather == horse_weather_preference:
-            return 1.1  # 10% boost in preferred weather
-        elif self.current_weather in ["Rainy"] and horse_weather_preference in ["Sunny"]:
-            return 0.8  # 20% penalty in opposite conditions
-        else:
-            return 1.0  # Neutral
+# Start the mixer on demand (nothing is initialized at import time).
+# Returns False when there is no audio device
+def init_mixer():
+    try:
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        return True
+    except pygame.error:
+        return False
 
 # Main game manager
 class GameManager:
-    def __init__(self, screen=None):
-        # Wallet for financial management
-        self.wallet = Wallet(STARTING_CASH, DEBT_TO_PAY)
-        
+    # headless: no sounds, images or sprites (defaults to True when there is no screen)
+    # save_state: campaign to resume (from SaveGame.load_campaign) instead of starting a new one
+    # save_path: where autosave() writes the campaign (None = never)
+    # race_history: RaceHistory that every finished race is logged to (None = don't log)
+    def __init__(self, screen=None, seed=None, headless=None, save_state=None, save_path=None, race_history=None):
+        self.headless = screen is None if headless is None else headless
+        self.save_path = save_path
+        self.race_history = race_history
+
+        # Every day gets its own RNG derived from the session seed,
+        # so the same seed always replays the same weather, fields and races
+        if save_state:
+            seed = save_state["session_seed"]
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        # Seeds of the campaigns after this one (PLAY AGAIN), so a seeded game stays reproducible across resets
+        self.campaign_seeds = random.Random(f"{seed}:campaigns")
+
         # Renderer for drawing (will be initialized later if screen provided)
         self.renderer = None
         if screen:
-            self.renderer = Renderer(screen, SCREEN_WIDTH, RACE_HEIGHT, UI_HEIGHT)
-        
-        self.day = 1
-        self.day_limit = DAY_LIMIT
-        self.game_state = "BETTING" 
+            self.renderer = Renderer(screen, SCREEN_WIDTH, RACE_HEIGHT, UI_HEIGHT, DIRTY_RECT_RENDERING)
         
-        # Track line positions
+        # Track line positions (track coordinates; the renderer's camera scrolls long tracks)
+        self.track_width = TRACK_WIDTH
         self.start_line_x = START_LINE_X
         self.finish_line_x = FINISH_LINE_X
         # Cheesy fix: logic line is further back so horse fully crosses visual line
-        self.actual_finish_line_x = self.finish_line_x + 50
+        self.actual_finish_line_x = self.finish_line_x + FINISH_LINE_OVERSHOOT
         self.track_top = TRACK_TOP_MARGIN
         self.track_bottom = TRACK_BOTTOM_MARGIN 
         
         # Build path to assets
         self.project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-        # Weather system
-        self.weather = Weather()
+        # Headless simulator that precomputes races (PRECOMPUTED_RACES)
+        self.race_simulator = RaceSimulator(self.start_line_x, self.actual_finish_line_x, HORSE_SPRITE_WIDTH)
 
-        # Load background image based on current weather
-        self._load_background_for_weather()
+        # No odds table for this distance (RACE_SCREENS changed): build and cache it on the
+        # asset loader. Computing the chances on the main thread instead stalls long tracks
+        # for seconds, so fields show the stat-based guess until it's ready.
+        if not odds_table.is_loaded():
+            print(f"Warning: No odds table for a {odds_table.distance}px race (RACE_SCREENS = {RACE_SCREENS}), "
+                  f"building it in the background; ship it with python -m core.OddsTable")
+            asset_manager.load(("odds_table", odds_table.distance), odds_table.build)
+
+        # Queue every weather background and sound effect on the asset loader
+        # (they pop in when ready, the first frame doesn't wait for them)
+        if not self.headless:
+            self._queue_backgrounds()
         
-        # Load sound effects
-        try:
-            pygame.mixer.init()
-            sounds_path = os.path.join(self.project_root, "Sounds")
-            self.sound_bet_low = pygame.mixer.Sound(os.path.join(sounds_path, "select_low.wav"))
-            self.sound_bet_mid = pygame.mixer.Sound(os.path.join(sounds_path, "select_normal.wav"))
-            self.sound_bet_high = pygame.mixer.Sound(os.path.join(sounds_path, "select_high.wav"))
-            self.sound_cash_register = pygame.mixer.Sound(os.path.join(sounds_path, "cash_register.mp3"))
-            self.sound_horse_gallop = pygame.mixer.Sound(os.path.join(sounds_path, "horse_galloping.mp3"))
-            self.sound_losing_bell = pygame.mixer.Sound(os.path.join(sounds_path, "losing_bell.wav"))
-            self.sound_click = pygame.mixer.Sound(os.path.join(sounds_path, "clicking.wav"))
-            
-            # Load and play background music on loop
-            try:
-                bg_music_path = os.path.join(sounds_path, "background_music.mp3")
-                pygame.mixer.music.load(bg_music_path)
-                pygame.mixer.music.set_volume(0.4)  # Lower volume for background music
-                pygame.mixer.music.play(-1)  # Loop infinitely
-            except:
-                print("Warning: Could not load background music.")
-
-        except:
-            print("Warning: Could not load sound files. Game will run without audio.")
-            self.sound_bet_low = None
-            self.sound_bet_mid = None
-            self.sound_bet_high = None
-            self.sound_cash_register = None
-            self.sound_horse_gallop = None
-            self.sound_losing_bell = None
-            self.sound_click = None
+        # Sound effects (loaded once per process, None = silent)
+        self.sounds = None
+        if not self.headless:
+            self._load_sounds()
         
         # Available horse sprite pairs (idle, run)
         self.available_horse_colors = ["black", "brown", "brown2", "gray", "white", "yellow"]
@@ -149,13 +168,56 @@ class GameManager:
             idle_path = os.path.join(self.project_root, "Assets", f"horses_idle_right_{color}.png")
             run_path = os.path.join(self.project_root, "Assets", f"horses_run_right_{color}.png")
             self.available_sprites.append((idle_path, run_path))
-        
-        self.horses = self._create_horses()
-        
-        self.selected_horse = self.horses[0]
+        # Decode and scale every strip once per process (no-op after the first game).
+        # Horses need these for the first frame, so wait for them behind a loading screen.
+        if not self.headless:
+            if sprite_cache.atlas is None:
+                sprite_cache.load_atlas(atlas_index_path(HORSE_SPRITE_WIDTH, HORSE_SPRITE_HEIGHT))
+            sprite_keys = Horse.preload_sprites(self.available_sprites, HORSE_SPRITE_WIDTH, HORSE_SPRITE_HEIGHT, asset_manager)
+            if CUSTOM_HORSES and horse_compositor.is_available():
+                sprite_keys += horse_compositor.preload_layers(HORSE_SPRITE_WIDTH, HORSE_SPRITE_HEIGHT, asset_manager)
+            asset_manager.wait(sprite_keys, self._draw_loading_progress)
+
+        self._reset_campaign(seed, save_state)
+
+    # Everything that belongs to one campaign: wallet, day, weather, field and race.
+    # The renderer, sounds, sprites and simulator outlive it (see full_game_reset).
+    def _reset_campaign(self, seed, save_state=None):
+        self.session_seed = seed
+        # What the last race paid back (stake included, 0 on a loss)
+        self.last_payout = 0
+
+        # Wallet for financial management
+        self.wallet = Wallet(STARTING_CASH, DEBT_TO_PAY)
+
+        self.day = 1
+        self.day_limit = DAY_LIMIT
+        self.rng = self.make_day_rng(self.day)
+        self.game_state = "BETTING" 
+        # Real time not yet consumed by fixed simulation steps
+        self.accumulator_ms = 0.0
+
+        # Weather system
+        self.weather = Weather(self.rng)
+        self._load_background_for_weather()
+
         self.selected_bet_pct = 0
         self.winner = None
         self.game_over_message = ""
+        # Precomputed race (PRECOMPUTED_RACES): per-tick positions, winner index and playback tick
+        self.race_positions = None
+        self.race_winner_index = None
+        self.race_tick = 0
+        # Recording of the race in progress, the last finished race, and its viewer while it plays
+        self.race_recorder = None
+        self.last_replay = None
+        self.replay_player = None
+
+        if save_state:
+            self._restore_save_state(save_state)
+        else:
+            self.horses = self._create_horses()
+            self.selected_horse = self.horses[0]
     
     # Setup horses with random sprites and names
     def _create_horses(self):
@@ -163,40 +225,172 @@ class GameManager:
         y_positions = [90, 110, 130, 155, 180]
         
         # Randomly choose 3-5 horses for this race
-        num_horses = random.randint(3, 5)
-        used_sprite_pairs = random.sample(self.available_sprites, min(num_horses, len(self.available_sprites)))
+        num_horses = self.rng.randint(MIN_HORSES, MAX_HORSES)
+        used_sprite_pairs = self.rng.sample(self.available_sprites, min(num_horses, len(self.available_sprites)))
         used_y_positions = y_positions[:num_horses]
         # Pick unique names
-        used_names = random.sample(HORSE_NAMES, num_horses)
+        used_names = self.rng.sample(HORSE_NAMES, num_horses)
+        # Positions, stats and animation frames for the whole field, stepped together
+        self.race_state = RaceState(num_horses, START_LINE_X, HORSE_SPRITE_WIDTH)
         
         for i, (sprite_pair, y_pos, name) in enumerate(zip(used_sprite_pairs, used_y_positions, used_names)):
             idle_path, run_path = sprite_pair
-            weather_pref = random.choice(WEATHER_TYPES)
+            weather_pref = self.rng.choice(WEATHER_TYPES)
+            appearance = None
+            if CUSTOM_HORSES and horse_compositor.is_available():
+                appearance = horse_compositor.random_appearance(self.rng)
             horse = Horse(
                 name=name,
                 y_pos=y_pos,
                 idle_strip_path=idle_path,
                 run_strip_path=run_path,
-                color_fallback=(random.randint(100, 255), random.randint(100, 255), random.randint(100, 255)),
+                color_fallback=(self.rng.randint(100, 255), self.rng.randint(100, 255), self.rng.randint(100, 255)),
                 start_line_x=START_LINE_X,
                 horse_sprite_width=HORSE_SPRITE_WIDTH,
                 horse_sprite_height=HORSE_SPRITE_HEIGHT,
                 animation_speed_ms=ANIMATION_SPEED_MS,
-                weather_preference=weather_pref
+                weather_preference=weather_pref,
+                rng=self.rng,
+                headless=self.headless,
+                appearance=appearance,
+                race_state=self.race_state,
+                state_index=i
             )
             horses.append(horse)
+
+        # Replace the stat-based guess with the field's exact win chances and payouts (table lookups)
+        if odds_table.is_loaded():
+            win_probabilities = odds_table.estimate_field(horses, self.weather)
+            for horse, probability in zip(horses, win_probabilities):
+                horse.set_win_probability(probability)
+
+        self._index_horses(horses)
         
         return horses
 
+    # Horses only get picked while they stand at the start line, so index those hitboxes once
+    def _index_horses(self, horses):
+        self.horse_hit_index = HitIndex((i, horse.hitbox) for i, horse in enumerate(horses))
+
+    # Everything needed to resume the campaign (see core/SaveGame.py); not available mid-race
+    def get_save_state(self):
+        if self.game_state == "RACING":
+            raise ValueError("Can't save a campaign in the middle of a race")
+        state = self.get_snapshot()
+        state["rng_state"] = self.rng.getstate()
+        return state
+
+    # Everything needed to draw the campaign as it is right now (any state, no RNG)
+    def get_snapshot(self):
+        return {
+            "session_seed": self.session_seed,
+            "day": self.day,
+            "game_state": self.game_state,
+            "game_over_message": self.game_over_message,
+            "cash": self.wallet.cash,
+            "debt": self.wallet.debt,
+            "original_debt": self.wallet.original_debt,
+            "starting_cash": self.wallet.starting_cash,
+            "bet_amount": self.wallet.bet_amount,
+            "selected_bet_pct": self.selected_bet_pct,
+            "weather": self.weather.current_weather,
+            "selected_index": self.horses.index(self.selected_horse),
+            "winner_index": self.horses.index(self.winner) if self.winner in self.horses else -1,
+            "horses": [{
+                "name": horse.name,
+                "y": horse.y,
+                "idle_strip_path": horse.idle_strip_path,
+                "run_strip_path": horse.run_strip_path,
+                "appearance": horse.appearance,
+                "weather_preference": horse.weather_preference,
+                "stats": dict(horse.stats),
+                "multiplier": horse.multiplier,
+                "winrate_percent": horse.winrate_percent,
+                "color_fallback": horse.color_fallback,
+                "exact_x": horse.exact_x,
+            } for horse in self.horses],
+        }
+
+    # Rebuild a saved campaign (no field generation or pricing needed)
+    def _restore_save_state(self, state):
+        self.day = state["day"]
+        self.game_state = state["game_state"]
+        self.game_over_message = state["game_over_message"]
+        self.wallet.cash = state["cash"]
+        self.wallet.debt = state["debt"]
+        self.wallet.original_debt = state["original_debt"]
+        self.wallet.starting_cash = state["starting_cash"]
+        self.wallet.bet_amount = state["bet_amount"]
+        self.selected_bet_pct = state["selected_bet_pct"]
+        self.weather.current_weather = state["weather"]
+        self._load_background_for_weather()
+
+        saved_horses = state["horses"]
+        self.race_state = RaceState(len(saved_horses), START_LINE_X, HORSE_SPRITE_WIDTH)
+        self.horses = []
+        for i, saved in enumerate(saved_horses):
+            appearance = tuple(saved["appearance"]) if saved["appearance"] else None
+            # Customization art went missing: fall back to the flat strips
+            if appearance and not all(os.path.exists(layer) for layer in appearance if layer):
+                appearance = None
+            horse = Horse(
+                name=saved["name"],
+                y_pos=saved["y"],
+                idle_strip_path=saved["idle_strip_path"],
+                run_strip_path=saved["run_strip_path"],
+                color_fallback=tuple(saved["color_fallback"]),
+                start_line_x=START_LINE_X,
+                horse_sprite_width=HORSE_SPRITE_WIDTH,
+                horse_sprite_height=HORSE_SPRITE_HEIGHT,
+                animation_speed_ms=ANIMATION_SPEED_MS,
+                weather_preference=saved["weather_preference"],
+                rng=self.rng,
+                headless=self.headless,
+                appearance=appearance,
+                race_state=self.race_state,
+                state_index=i
+            )
+            horse.stats = saved["stats"]
+            horse.multiplier = saved["multiplier"]
+            horse.winrate_percent = saved["winrate_percent"]
+            self.horses.append(horse)
+        self.race_state.set_positions([saved["exact_x"] for saved in saved_horses])
+        self._index_horses(self.horses)
+
+        self.selected_horse = self.horses[state["selected_index"]]
+        self.winner = self.horses[state["winner_index"]] if state["winner_index"] >= 0 else None
+        # Last, since building the horses drew from the RNG (snapshots don't carry one)
+        if "rng_state" in state:
+            self.rng.setstate(state["rng_state"])
+
+    # Show a snapshot from get_snapshot() (thin clients mirror a GameServer session this way)
+    def apply_snapshot(self, state):
+        self._restore_save_state(state)
+        if self.game_state == "RACING":
+            for horse in self.horses:
+                horse.set_animation_state("RUNNING")
+
+    # Write the campaign on the save thread (no-op without a save_path)
+    def autosave(self):
+        if self.save_path:
+            save_campaign_async(self, self.save_path)
+
+    # Seed for a given day, derived from the session seed
+    def day_seed(self, day):
+        return f"{self.session_seed}:{day}"
+
+    def make_day_rng(self, day):
+        return random.Random(self.day_seed(day))
+
     def select_horse(self, mouse_pos):
         if self.game_state != "BETTING":
             return
-        for horse in self.horses:
-            if horse.hitbox.collidepoint(mouse_pos):
-                self.selected_horse = horse
-                self.wallet.reset_bet()
-                self.selected_bet_pct = 0
-                break
+        # Lanes overlap, so the horse whose hitbox center is closest to the click wins
+        index = self.horse_hit_index.hit(mouse_pos)
+        if index is not None:
+            self.selected_horse = self.horses[index]
+            self.wallet.reset_bet()
+            self.selected_bet_pct = 0
 
     def set_bet(self, percent):
         if self.game_state != "BETTING":
@@ -209,54 +403,149 @@ class GameManager:
             self.wallet.place_bet(self.wallet.bet_amount)
             self.game_state = "RACING"
             self.winner = None
+            self.accumulator_ms = 0.0
+            self.race_state.set_weather_modifiers(
+                [self.weather.get_performance_modifier(horse.weather_preference) for horse in self.horses])
+            if PRECOMPUTED_RACES:
+                self._precompute_race()
+            else:
+                self.race_state.reseed(self.rng.getrandbits(64))
+            self.race_recorder = RaceRecorder(self.race_state) if RECORD_REPLAYS else None
             
             # Play gallop sound on loop (-1 means infinite loop)
-            if self.sound_horse_gallop:
-                self.sound_horse_gallop.play(loops=-1)
+            if self.sounds:
+                self.sounds.play("horse_gallop", loops=-1)
             
             # Switch all horses to RUNNING animation
             for horse in self.horses:
                 horse.set_animation_state("RUNNING")
+            if self.race_recorder:
+                self.race_recorder.record()
+
+    # Advance the game by real elapsed time using fixed simulation steps
+    def update(self, elapsed_ms):
+        if not self.headless:
+            self._poll_assets()
+
+        if self.game_state == "RACING":
+            self.accumulator_ms += elapsed_ms
+            steps = 0
+            with frame_profiler.phase("race_ticks"):
+                while self.accumulator_ms >= SIMULATION_STEP_MS and self.game_state == "RACING":
+                    self.update_race()
+                    self.accumulator_ms -= SIMULATION_STEP_MS
+                    steps += 1
+                    if steps >= MAX_SIMULATION_STEPS_PER_FRAME:
+                        self.accumulator_ms = 0.0
+                        break
+        else:
+            self.accumulator_ms = 0.0
+
+        with frame_profiler.phase("horse_anim"):
+            if self.replay_player:
+                self.replay_player.update(elapsed_ms)
+                self.replay_player.apply(self.race_state)
+            elif self.game_state == "RACING":
+                # Draw horses part way to their next tick for smooth motion at any FPS
+                self.race_state.interpolate(self.accumulator_ms / SIMULATION_STEP_MS)
+            else:
+                self.race_state.interpolate(1.0)
+                if self.game_state == "BETTING":
+                    # Continually update animation so idle frames cycle
+                    self.race_state.update_animation(pygame.time.get_ticks(), ANIMATION_SPEED_MS)
 
     def update_race(self):
         if self.game_state != "RACING":
             return
 
-        for horse in self.horses:
-            # Get weather modifier for this horse
-            weather_mod = self.weather.get_performance_modifier(horse.weather_preference)
-            horse.move(weather_mod)
-            horse.update() # Update animation while racing
-            if horse.rect.right >= self.actual_finish_line_x and not self.winner: # First horse to cross (real line)
-                self.winner = horse
-                self.game_state = "POST_RACE"
-                # Stop gallop sound when race ends
-                if self.sound_horse_gallop:
-                    self.sound_horse_gallop.stop()
-                self.process_winnings()
-                self.next_day()
-                break
+        if self.race_positions is not None:
+            self._play_race_tick()
+            return
+
+        # Move the whole field at once; the first horse to cross the real line wins
+        winner_index = self.race_state.step(self.actual_finish_line_x)
+        self.race_state.update_animation(pygame.time.get_ticks(), ANIMATION_SPEED_MS) # Update animation while racing
+        if self.race_recorder:
+            self.race_recorder.record()
+        if winner_index is not None:
+            self._finish_race(self.horses[winner_index])
+
+    # Run the whole race up front; RACING then only indexes into the result
+    def _precompute_race(self):
+        self.race_positions, self.race_winner_index = self.race_simulator.simulate_race(
+            self.race_state.speeds(), self.race_state.staminas(), self.race_state.weather_modifiers,
+            seed=self.rng.getrandbits(64))
+        self.race_tick = 0
+
+    def _play_race_tick(self):
+        self.race_tick += 1
+        self.race_state.set_positions(self.race_positions[self.race_tick])
+        self.race_state.update_animation(pygame.time.get_ticks(), ANIMATION_SPEED_MS) # Update animation while racing
+        if self.race_recorder:
+            self.race_recorder.record()
+        if self.race_tick == len(self.race_positions) - 1:
+            self._finish_race(self.horses[self.race_winner_index])
+
+    # Skip the rest of a precomputed race and settle the bet right away
+    def settle_race(self):
+        if self.game_state == "RACING" and self.race_positions is not None:
+            self.race_tick = len(self.race_positions) - 2
+            self._play_race_tick()
+
+    def _finish_race(self, winner):
+        self.winner = winner
+        self.game_state = "POST_RACE"
+        self.race_positions = None
+        if self.race_recorder:
+            self.last_replay = self.race_recorder.finish(self.horses.index(winner))
+            self.race_recorder = None
+        # Stop gallop sound when race ends
+        if self.sounds:
+            self.sounds.stop_group("gallop")
+        self.process_winnings()
+        self.record_race()
+        self.next_day()
+        self.autosave()
                 
     def process_winnings(self):
+        self.last_payout = 0
         if self.winner == self.selected_horse:
             winnings = math.floor(self.wallet.bet_amount * self.selected_horse.multiplier)
-            self.wallet.add_winnings(winnings + self.wallet.bet_amount)
+            self.last_payout = winnings + self.wallet.bet_amount
+            self.wallet.add_winnings(self.last_payout)
             # Play cash register sound on win
-            if self.sound_cash_register:
-                self.sound_cash_register.play()
+            if self.sounds:
+                self.sounds.play("cash_register")
         else:
             # Play losing bell sound when losing the bet
-            if self.sound_losing_bell:
-                self.sound_losing_bell.play()
+            if self.sounds:
+                self.sounds.play("losing_bell")
         self.wallet.update_debt()
     
+    # Queue the race that just finished for the history log (no-op without a race_history)
+    def record_race(self):
+        if not self.race_history:
+            return
+        field = [{
+            "name": horse.name,
+            "stats": horse.stats,
+            "weather_preference": horse.weather_preference,
+            "winrate_percent": horse.winrate_percent,
+            "multiplier": horse.multiplier,
+        } for horse in self.horses]
+        self.race_history.record_race(
+            self.session_seed, self.day, self.weather.current_weather, field,
+            self.horses.index(self.winner), self.horses.index(self.selected_horse),
+            self.wallet.bet_amount, self.last_payout, self.wallet.cash,
+            encode_replay(self.last_replay) if self.last_replay else None)
+
     def next_day(self):
         self.day += 1
         if self.wallet.check_bankruptcy() and self.day <= self.day_limit:
             self.game_state = "GAME_OVER"
             self.game_over_message = "You're Bankrupt!"
-            if self.sound_losing_bell:
-                self.sound_losing_bell.play()
+            if self.sounds:
+                self.sounds.play("losing_bell")
         elif self.day > self.day_limit: #win only if debt is zero at month end
             if self.wallet.debt == 0:
                 self.game_state = "GAME_OVER"
@@ -264,101 +553,207 @@ class GameManager:
             else:
                 self.game_state = "GAME_OVER"
                 self.game_over_message = "You Failed to Pay the Debt!"
-                if self.sound_losing_bell:
-                    self.sound_losing_bell.play()
+                if self.sounds:
+                    self.sounds.play("losing_bell")
                 
     def reset_for_next_race(self):
         if self.game_state == "POST_RACE":
+            self.stop_replay()
+            self.last_replay = None
             self.game_state = "BETTING"
             self.wallet.reset_bet()
             self.selected_bet_pct = 0
             # Change weather and regenerate horses for variety
-            self.weather.change_weather()
+            self.rng = self.make_day_rng(self.day)
+            self.weather.change_weather(self.rng)
             # Update background to match new weather
             self._load_background_for_weather()
             self.horses = self._create_horses()
             self.selected_horse = self.horses[0]
 
-    # Load background based on weather
-    def _load_background_for_weather(self):
-        try:
-            # Map weather to asset filenames
-            if self.weather.current_weather == "Sunny":
-                bg_filename = "horse_race_arena_sunny.png"
-            elif self.weather.current_weather == "Rainy":
-                bg_filename = "horse_race_arena_rainy.png"
-            else:
-                bg_filename = "horse_race_arena_sunny.png"  # default
+    # Queue the sound bank (a no-op after the first game) and keep the music going
+    def _load_sounds(self):
+        if not init_mixer():
+            print("Warning: Could not load sound files. Game will run without audio.")
+            return
+        sounds_path = os.path.join(self.project_root, "Sounds")
+        sound_bank.load({name: (os.path.join(sounds_path, filename), group)
+                         for name, (filename, group) in SOUND_FILES.items()})
+        # Streamed, so not worth a thread
+        sound_bank.play_music(os.path.join(sounds_path, BACKGROUND_MUSIC), MUSIC_VOLUME)
+        self.sounds = sound_bank
 
+    # Queue the background for every weather type (each file is only loaded once per process)
+    def _queue_backgrounds(self):
+        for bg_filename in list(WEATHER_BACKGROUNDS.values()) + [DEFAULT_BACKGROUND]:
             bg_path = os.path.join(self.project_root, "Assets", bg_filename)
-            self.background = pygame.image.load(bg_path).convert()
-            self.background = pygame.transform.scale(self.background, (SCREEN_WIDTH, RACE_HEIGHT))
-        except Exception:
-            # Fallback: no background image, use solid fill
-            self.background = None
+            asset_manager.load_image(("background", bg_filename), bg_path, size=(SCREEN_WIDTH, RACE_HEIGHT))
+
+    # Cached background for the current weather (None = solid fill).
+    # Falls back to the generic arena when the weather art is missing.
+    def _find_background(self):
+        for bg_filename in (WEATHER_BACKGROUNDS.get(self.weather.current_weather, DEFAULT_BACKGROUND), DEFAULT_BACKGROUND):
+            background = asset_manager.get(("background", bg_filename))
+            if background:
+                return background
+        return None
 
+    def _load_background_for_weather(self):
+        self.background = self._find_background()
+
+    # Finish any assets that arrived since the last frame. The loader is shared by every
+    # GameManager in the process, so another instance may have finished our background:
+    # pick it up whenever the cache has something newer than what we draw.
+    def _poll_assets(self):
+        asset_manager.poll()
+        if self.background is not self._find_background():
+            self._load_background_for_weather()
+
+    def _draw_loading_progress(self, finished, requested):
+        if self.renderer:
+            self.renderer.draw_loading_screen(finished, requested)
+            pygame.display.flip()
+            pygame.event.pump()
+
+    # New campaign in place: keeps the renderer (and its caches), sounds and sprites,
+    # and takes the next seed from the game's seed sequence
     def full_game_reset(self):
-        screen = self.renderer.screen if self.renderer else None
-        self.__init__(screen)
+        self._reset_campaign(self.campaign_seeds.randrange(2 ** 32))
+        self.autosave()
 
     def handle_click(self, pos):
         if pos[1] < RACE_HEIGHT:
             self.select_horse(pos)
             return
+        widget = ui_hit_index.hit(pos)
         if self.game_state == "BETTING":
-            if self.renderer.play_button_rect.collidepoint(pos):
-                if self.sound_click:
-                    self.sound_click.play()
+            if widget == "play_button":
+                if self.sounds:
+                    self.sounds.play("click")
                 self.start_race()
-            elif self.renderer.bet_25_rect.collidepoint(pos):
+            elif widget == "bet_25":
                 self.set_bet(25)
-                if self.sound_bet_low:
-                    self.sound_bet_low.play()
-            elif self.renderer.bet_50_rect.collidepoint(pos):
+                if self.sounds:
+                    self.sounds.play("bet_low")
+            elif widget == "bet_50":
                 self.set_bet(50)
-                if self.sound_bet_mid:
-                    self.sound_bet_mid.play()
-            elif self.renderer.bet_100_rect.collidepoint(pos):
+                if self.sounds:
+                    self.sounds.play("bet_mid")
+            elif widget == "bet_100":
                 self.set_bet(100)
-                if self.sound_bet_high:
-                    self.sound_bet_high.play()
+                if self.sounds:
+                    self.sounds.play("bet_high")
         elif self.game_state == "POST_RACE":
-            if self.renderer.play_button_rect.collidepoint(pos):
+            if widget == "play_button":
                 self.reset_for_next_race()
         elif self.game_state == "GAME_OVER":
-            if self.renderer.play_button_rect.collidepoint(pos):
+            if widget == "play_button":
                 self.full_game_reset()
 
+    # Watch the last race again (results screens only); the field still stands where it finished
+    def start_replay(self):
+        if self.game_state in ("POST_RACE", "GAME_OVER") and self.last_replay and not self.replay_player:
+            self.replay_player = ReplayPlayer(self.last_replay, SIMULATION_STEP_MS)
+            self.replay_player.apply(self.race_state)
+
+    # Back to the finish positions
+    def stop_replay(self):
+        if self.replay_player:
+            self.replay_player.seek(self.replay_player.last_tick)
+            self.replay_player.apply(self.race_state)
+            self.replay_player = None
+
+    def handle_key(self, key):
+        if key == REPLAY_KEY:
+            if self.replay_player:
+                self.stop_replay()
+            else:
+                self.start_replay()
+            return
+        player = self.replay_player
+        if not player:
+            return
+        if key == REPLAY_PAUSE_KEY:
+            player.toggle_pause()
+        elif key in REPLAY_STEP_KEYS:
+            player.step(REPLAY_STEP_KEYS[key])
+        elif key in REPLAY_SEEK_KEYS:
+            player.seek(player.tick + REPLAY_SEEK_KEYS[key])
+        elif key == pygame.K_HOME:
+            player.seek(0)
+        elif key == pygame.K_END:
+            player.seek(player.last_tick)
+        elif key in REPLAY_SPEED_KEYS:
+            player.set_speed(REPLAY_SPEED_KEYS[key])
+
+    # Returns changed rects in dirty-rect mode, None when the full frame was drawn
     def draw(self, surface):
-        self.renderer.draw_game_state(self)
+        return self.renderer.draw_game_state(self)
 
-def main():
+def main(seed=None):
+    #Initialization
+    pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Horse Race Betting Tycoon")
     
-    game_manager = GameManager(screen)
+    # Resume the last campaign unless a specific seed was asked for
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    save_path = os.path.join(project_root, SAVE_FILE) if AUTOSAVE else None
+    save_state = None
+    if save_path and seed is None and os.path.exists(save_path):
+        try:
+            save_state = load_campaign(save_path)
+        except (OSError, SaveError) as e:
+            print(f"Warning: Could not resume campaign from {save_path}: {e}")
+
+    race_history = RaceHistory(os.path.join(project_root, HISTORY_FILE)) if RACE_HISTORY else None
+
+    game_manager = GameManager(screen, seed, save_state=save_state, save_path=save_path, race_history=race_history)
     clock = pygame.time.Clock()
     running = True
+    frame_profiler.set_enabled(PROFILE_FRAMES)
+    trace_path = os.path.join(game_manager.project_root, TRACE_FILE)
 
     while running:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            if event.type == pygame.MOUSEBUTTONDOWN:
-                game_manager.handle_click(event.pos)
-
-        # Logic Update
-        if game_manager.game_state == "RACING":
-            game_manager.update_race()
-        elif game_manager.game_state == "BETTING":
-             # Continually update animation so idle frames cycle 
-             for horse in game_manager.horses:
-                horse.update()
-
-        game_manager.draw(screen) 
-        pygame.display.flip()
-        clock.tick(60)
-        
+        frame_profiler.begin_frame()
+        with frame_profiler.phase("events"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    game_manager.handle_click(event.pos)
+                if event.type == pygame.KEYDOWN and event.key == PROFILER_OVERLAY_KEY:
+                    frame_profiler.toggle_overlay()
+                    # Repaint whatever the overlay was covering
+                    game_manager.renderer.invalidate()
+                if event.type == pygame.KEYDOWN and event.key == TRACE_DUMP_KEY and frame_profiler.enabled:
+                    count = frame_profiler.dump_trace(trace_path)
+                    print(f"Wrote {count} trace events to {trace_path}")
+                if event.type == pygame.KEYDOWN:
+                    game_manager.handle_key(event.key)
+
+        # Logic Update (fixed timestep, independent of frame rate)
+        with frame_profiler.phase("update"):
+            game_manager.update(clock.get_time())
+
+        with frame_profiler.phase("draw"):
+            dirty_rects = game_manager.draw(screen)
+        overlay_rect = frame_profiler.draw_overlay(screen)
+        if overlay_rect and dirty_rects is not None:
+            dirty_rects = dirty_rects + [overlay_rect]
+        with frame_profiler.phase("flip"):
+            if dirty_rects is None:
+                pygame.display.flip()
+            elif dirty_rects:
+                pygame.display.update(dirty_rects)
+        frame_profiler.end_frame()
+        clock.tick(FPS)
+
+    if frame_profiler.enabled:
+        frame_profiler.dump_trace(trace_path)
+    flush_saves()
+    if race_history:
+        race_history.close()
     pygame.quit()
     sys.exit()
 
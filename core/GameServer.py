@@ -0,0 +1,255 @@
+import argparse
+import asyncio
+import json
+import time
+import sys
+import os
+from collections import deque
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.GameManager import GameManager, SIMULATION_HZ
+from core.RaceHistory import RaceHistory
+
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 7777
+# Ticks kept per session for the rolling latency percentiles
+LATENCY_WINDOW = 600
+PERCENTILES = (50, 95, 99)
+# Skip position updates to a client whose socket has this much unsent data (it catches up on the next state)
+MAX_PENDING_BYTES = 64 * 1024
+
+
+# Newline-delimited JSON, one message per line
+def encode_message(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+# Raises ValueError for anything that isn't a well-formed client message
+# (bad JSON, not an object, a click without an [x, y] pair of ints)
+def decode_message(line):
+    message = json.loads(line)
+    if not isinstance(message, dict):
+        raise ValueError("message is not a JSON object")
+    if message.get("type") == "click":
+        pos = message.get("pos")
+        if (not isinstance(pos, (list, tuple)) or len(pos) != 2
+                or not all(isinstance(v, int) and not isinstance(v, bool) for v in pos)):
+            raise ValueError("click needs pos: [x, y]")
+    return message
+
+
+# Same wire format as encode_message, for the one message every racing session sends every tick
+def encode_positions(positions):
+    return b'{"type":"positions","x":[' + ",".join(map(str, positions)).encode("ascii") + b']}\n'
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    if not samples:
+        return {}
+    return {f"p{p}": samples[min(len(samples) - 1, len(samples) * p // 100)] for p in PERCENTILES}
+
+
+# One kiosk: a headless GameManager plus the connection that drives it
+class Session:
+    def __init__(self, session_id, writer, seed=None, race_history=None):
+        self.session_id = session_id
+        self.writer = writer
+        self.game_manager = GameManager(seed=seed, headless=True, race_history=race_history)
+        self.tick_times = deque(maxlen=LATENCY_WINDOW)  # ms spent in update() per tick
+        self.ticks = 0
+        # What the client last saw; a new state is sent whenever this changes
+        self.state_key = None
+
+    def _get_state_key(self):
+        game_manager = self.game_manager
+        return (
+            game_manager.session_seed, game_manager.day, game_manager.game_state, id(game_manager.horses),
+            id(game_manager.selected_horse), id(game_manager.winner), game_manager.selected_bet_pct,
+            game_manager.wallet.cash, game_manager.wallet.bet_amount, game_manager.weather.current_weather
+        )
+
+    def send(self, message):
+        self._write(encode_message(message))
+
+    def _write(self, data):
+        if not self.writer.is_closing():
+            self.writer.write(data)
+
+    # Send the full state if anything on screen changed, otherwise just the field's positions
+    def publish(self):
+        state_key = self._get_state_key()
+        if state_key != self.state_key:
+            self.state_key = state_key
+            self.send({"type": "state", "state": self.game_manager.get_snapshot()})
+        elif self.game_manager.game_state == "RACING":
+            if self.writer.transport.get_write_buffer_size() > MAX_PENDING_BYTES:
+                return
+            self._write(encode_positions(self.game_manager.race_state.draw_x.tolist()))
+
+    def handle_message(self, message):
+        if message.get("type") == "click":
+            self.game_manager.handle_click(tuple(message["pos"]))
+
+    # Advance the race by elapsed_ms; only racing sessions have anything to simulate
+    def tick(self, elapsed_ms):
+        if self.game_manager.game_state != "RACING":
+            return
+        start = time.perf_counter()
+        self.game_manager.update(elapsed_ms)
+        self.tick_times.append((time.perf_counter() - start) * 1000)
+        self.ticks += 1
+
+    def get_metrics(self):
+        return {
+            "day": self.game_manager.day,
+            "game_state": self.game_manager.game_state,
+            "ticks": self.ticks,
+            "tick_ms": _percentiles(self.tick_times),
+        }
+
+
+# GameServer - hosts many independent game sessions in one process.
+# Every connection gets its own headless GameManager (and Wallet); one scheduler
+# task advances all of their races at SIMULATION_HZ, so an idle session costs
+# nothing and a racing one costs a single update() per tick. Clients only draw
+# (see core/GameClient.py) and send clicks, which go straight to handle_click.
+#
+# Protocol, newline-delimited JSON:
+#   client -> server  {"type": "click", "pos": [x, y]}
+#                     {"type": "metrics"}
+#   server -> client  {"type": "state", "state": GameManager.get_snapshot()}
+#                     {"type": "positions", "x": [draw x of every horse]}   (while racing)
+#                     {"type": "metrics", ...}                              (reply)
+class GameServer:
+    def __init__(self, host=SERVER_HOST, port=SERVER_PORT, tick_hz=SIMULATION_HZ, seed=None, race_history=None):
+        self.host = host
+        self.port = port
+        self.tick_interval = 1.0 / tick_hz
+        # Session n plays seed + n when a seed is given, a random seed otherwise
+        self.seed = seed
+        self.race_history = race_history
+        self.sessions = {}
+        self.next_session_id = 0
+        self.connection_tasks = set()
+        self.server = None
+        self.scheduler = None
+        # How late each scheduler tick started, and how long it took for every session (ms)
+        self.tick_lag = deque(maxlen=LATENCY_WINDOW)
+        self.tick_durations = deque(maxlen=LATENCY_WINDOW)
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        # Port 0 picks a free port; report the real one
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.scheduler = asyncio.create_task(self._run_scheduler())
+
+    async def serve_forever(self):
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def stop(self):
+        if self.scheduler:
+            self.scheduler.cancel()
+            await asyncio.gather(self.scheduler, return_exceptions=True)
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        # Closing the sockets ends every connection handler; wait for them to clean up
+        for session in list(self.sessions.values()):
+            session.writer.close()
+        await asyncio.gather(*self.connection_tasks, return_exceptions=True)
+
+    def create_session(self, writer):
+        session_id = self.next_session_id
+        self.next_session_id += 1
+        seed = None if self.seed is None else self.seed + session_id
+        session = Session(session_id, writer, seed, self.race_history)
+        self.sessions[session_id] = session
+        return session
+
+    async def _handle_connection(self, reader, writer):
+        self.connection_tasks.add(asyncio.current_task())
+        session = self.create_session(writer)
+        session.publish()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                # Undecodable or malformed messages are dropped, the session stays connected
+                try:
+                    message = decode_message(line)
+                except ValueError:
+                    continue
+                if message.get("type") == "metrics":
+                    session.send({"type": "metrics", **self.get_metrics()})
+                    continue
+                session.handle_message(message)
+                # Show the result of the click now rather than on the next tick
+                session.publish()
+        except ConnectionError:
+            pass
+        finally:
+            del self.sessions[session.session_id]
+            self.connection_tasks.discard(asyncio.current_task())
+            writer.close()
+
+    # Fixed-rate loop shared by every session
+    async def _run_scheduler(self):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        last_tick = next_tick
+        while True:
+            now = loop.time()
+            self.tick_lag.append(max(0.0, now - next_tick) * 1000)
+            self.tick_sessions((now - last_tick) * 1000)
+            last_tick = now
+            next_tick += self.tick_interval
+            # Fell more than a tick behind: start over from now instead of bursting to catch up
+            if next_tick < loop.time():
+                next_tick = loop.time()
+            await asyncio.sleep(next_tick - loop.time())
+
+    def tick_sessions(self, elapsed_ms):
+        start = time.perf_counter()
+        for session in list(self.sessions.values()):
+            session.tick(elapsed_ms)
+            session.publish()
+        self.tick_durations.append((time.perf_counter() - start) * 1000)
+
+    def get_metrics(self):
+        return {
+            "sessions": len(self.sessions),
+            "racing": sum(1 for session in self.sessions.values() if session.game_manager.game_state == "RACING"),
+            "tick_lag_ms": _percentiles(self.tick_lag),
+            "tick_ms": _percentiles(self.tick_durations),
+            "per_session": {session_id: session.get_metrics() for session_id, session in self.sessions.items()},
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Host many kiosk sessions in one headless process.")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--seed", type=int, default=None, help="Session n plays seed + n")
+    parser.add_argument("--history", default=None, help="Log every session's races to this RaceHistory file")
+    args = parser.parse_args()
+
+    race_history = RaceHistory(args.history) if args.history else None
+    server = GameServer(args.host, args.port, seed=args.seed, race_history=race_history)
+    print(f"Serving on {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if race_history:
+            race_history.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import numpy as np
+from bisect import bisect_right
+
+
+# HitIndex - point lookup over a set of rects (horse hitboxes, UI widgets).
+# Rects are kept sorted by their top edge, so a click only looks at the band of
+# rects that can reach its y (two bisects) and tests those with NumPy.
+# When rects overlap, the one whose center is nearest the point wins
+# (ties go to the rect that was listed first).
+class HitIndex:
+    # items: iterable of (key, rect); rect is a pygame.Rect or an (x, y, w, h) tuple
+    def __init__(self, items):
+        items = list(items)
+        self.keys = [key for key, _ in items]
+        boxes = np.array([tuple(rect) for _, rect in items], dtype=np.int64).reshape(-1, 4)
+        order = np.argsort(boxes[:, 1], kind="stable")
+        self.order = order
+        self.left = boxes[order, 0]
+        self.top = boxes[order, 1]
+        self.right = self.left + boxes[order, 2]
+        self.bottom = self.top + boxes[order, 3]
+        self.center_x = (self.left + self.right) / 2
+        self.center_y = (self.top + self.bottom) / 2
+        self.tops = self.top.tolist()
+        self.max_height = int(boxes[:, 3].max()) if len(items) else 0
+
+    # Build from a {key: rect} dict (e.g. Renderer.get_ui_rects())
+    @classmethod
+    def from_dict(cls, rects):
+        return cls(rects.items())
+
+    # Sorted positions of every rect containing pos
+    def _containing(self, pos):
+        x, y = pos
+        # Only rects with top in (y - max_height, y] can contain y
+        first = bisect_right(self.tops, y - self.max_height)
+        last = bisect_right(self.tops, y)
+        if first >= last:
+            return np.empty(0, dtype=np.int64)
+        band = slice(first, last)
+        inside = (self.left[band] <= x) & (x < self.right[band]) & (y < self.bottom[band])
+        return np.flatnonzero(inside) + first
+
+    # Key of the best rect under pos, or None
+    def hit(self, pos):
+        candidates = self._containing(pos)
+        if candidates.size == 0:
+            return None
+        if candidates.size > 1:
+            x, y = pos
+            distances = (self.center_x[candidates] - x) ** 2 + (self.center_y[candidates] - y) ** 2
+            # Nearest center, then original order
+            candidates = candidates[np.lexsort((self.order[candidates], distances))]
+        return self.keys[self.order[candidates[0]]]
+
+    # Keys of every rect under pos, in their original order
+    def hit_all(self, pos):
+        return [self.keys[i] for i in sorted(self.order[self._containing(pos)])]
+
+    def __len__(self):
+        return len(self.keys)
@@ -2,11 +2,21 @@ import pygame
 import random
 import sys
 import os
+from types import MappingProxyType
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from anims.SpriteSheet import SpriteSheet 
+from anims.SpriteCache import sprite_cache
+from anims.HorseCompositor import horse_compositor
+from core.HorseStats import roll_stats, odds_from_stats, multiplier_from_probability
+from core.RaceState import RaceState, STAT_COLUMNS
+
+# Source strip layout (Horses Sprites Pack)
+SPRITE_FRAME_WIDTH = 256
+SPRITE_FRAME_HEIGHT = 192
+IDLE_FRAME_COUNT = 3
+RUN_FRAME_COUNT = 5
 
 # Base GameObject class
 class GameObject:
@@ -24,37 +34,45 @@ class GameObject:
         pass
 
 # Horse class (inherits GameObject)
+# Numeric state (position, stats, animation frame) lives in a slot of a RaceState;
+# the Horse itself only keeps identity, sprites and odds.
 class Horse(GameObject):
     def __init__(self, name, y_pos, idle_strip_path, run_strip_path, color_fallback, 
                  start_line_x, horse_sprite_width, horse_sprite_height, animation_speed_ms,
-                 weather_preference="Sunny"):
+                 weather_preference="Sunny", rng=None, headless=False, appearance=None,
+                 race_state=None, state_index=0):
         
+        # Slot in the shared field state (a standalone horse gets a field of one)
+        if race_state is None:
+            race_state = RaceState(1, start_line_x, horse_sprite_width)
+        self.race_state = race_state
+        self.state_index = state_index
+        self.race_state.reset_positions(state_index)
+
         # inherit position
         super().__init__(start_line_x, y_pos)
         
         self.name = name
-        self.rect = pygame.Rect(start_line_x, y_pos, horse_sprite_width, horse_sprite_height)
+        self.width = horse_sprite_width
+        self.height = horse_sprite_height
         self.color_fallback = color_fallback
         self.start_line_x = start_line_x
-        # using float for smooth movement because rect only takes int
-        self.exact_x = float(start_line_x)
         self.animation_speed_ms = animation_speed_ms
         self.weather_preference = weather_preference
+        # Any random.Random-like object (defaults to the global random module)
+        self.rng = rng or random
+        # Layer tuple for a composited custom horse (None = use the flat color strips)
+        self.appearance = appearance
+        self.idle_strip_path = idle_strip_path
+        self.run_strip_path = run_strip_path
         
         # Hitbox for accurate collision detection (tighter than sprite rect)
         # Positioned at bottom-center of sprite where the horse body is
-        hitbox_width = 50
-        hitbox_height = 40
-        hitbox_x_offset = (horse_sprite_width - hitbox_width) // 2
-        hitbox_y_offset = horse_sprite_height - hitbox_height - 5
-        self.hitbox = pygame.Rect(
-            start_line_x + hitbox_x_offset,
-            y_pos + hitbox_y_offset,
-            hitbox_width,
-            hitbox_height
-        )
+        self.hitbox_width = 50
+        self.hitbox_height = 40
+        self.hitbox_x_offset = (horse_sprite_width - self.hitbox_width) // 2
+        self.hitbox_y_offset = horse_sprite_height - self.hitbox_height - 5
         
-        self.stats = {}
         self.winrate_percent = 0
         self.multiplier = 0
         self.generate_stats_and_odds()
@@ -64,77 +82,166 @@ class Horse(GameObject):
         self.idle_frames = []
         self.current_animation_frames = [] 
         self.animation_state = "IDLE" # Start in IDLE state
+        self.static_image = None # Shown when there are no animation frames
+        self.preview_cache = {} # size -> (source frame, scaled preview)
+
+        if headless:
+            # No surfaces at all (simulation / tooling)
+            return
 
         try:
-            # Load IDLE animation strip (3 frames, horizontal)
-            idle_sheet = SpriteSheet(idle_strip_path)
-            self.idle_frames = idle_sheet.get_animation_row(
-                frame_width=256,
-                frame_height=192,
-                num_frames=3,
-                scale_width=horse_sprite_width,
-                scale_height=horse_sprite_height,
-                row_index=0
-            )
-            
-            # Load RUN animation strip (5 frames, horizontal)
-            run_sheet = SpriteSheet(run_strip_path)
-            self.running_frames = run_sheet.get_animation_row(
-                frame_width=256,
-                frame_height=192,
-                num_frames=5,
-                scale_width=horse_sprite_width,
-                scale_height=horse_sprite_height,
-                row_index=0
-            )
-            
-            # Set the starting animation to IDLE
-            self.current_animation_frames = self.idle_frames
-            self.current_frame_index = 0
-            self.image = self.current_animation_frames[self.current_frame_index]
-            self.last_update_time = pygame.time.get_ticks()
+            if appearance:
+                # Custom horse: frames composited once per layer combination and shared
+                self.idle_frames, self.running_frames = horse_compositor.get_animation_frames(
+                    appearance, horse_sprite_width, horse_sprite_height
+                )
+            else:
+                # Load IDLE (3 frames) and RUN (5 frames) strips, shared through the sprite cache
+                self.idle_frames = sprite_cache.get_animation_row(
+                    *Horse.sprite_cache_key(idle_strip_path, IDLE_FRAME_COUNT, horse_sprite_width, horse_sprite_height)
+                )
+                self.running_frames = sprite_cache.get_animation_row(
+                    *Horse.sprite_cache_key(run_strip_path, RUN_FRAME_COUNT, horse_sprite_width, horse_sprite_height)
+                )
 
         except Exception as e:
             print(f"Error loading animations: {e}. Using color fallback.")
-            self.idle_frames = []
             self.running_frames = []
-            self.image = pygame.Surface((horse_sprite_width, horse_sprite_height))
-            self.image.fill(self.color_fallback)
-            self.idle_frames = [self.image]
-            self.current_animation_frames = self.idle_frames
-            self.current_frame_index = 0
-            self.last_update_time = pygame.time.get_ticks() 
+            self.static_image = pygame.Surface((horse_sprite_width, horse_sprite_height))
+            self.static_image.fill(self.color_fallback)
+            self.idle_frames = [self.static_image]
+
+        # Set the starting animation to IDLE
+        self.current_animation_frames = self.idle_frames
+        self.race_state.set_animation(self.state_index, len(self.idle_frames))
+        self.race_state.last_frame_time[self.state_index] = pygame.time.get_ticks()
+
+    #  Views onto the RaceState slot
+    @property
+    def exact_x(self):
+        return float(self.race_state.exact_x[self.state_index])
+
+    @exact_x.setter
+    def exact_x(self, value):
+        self.race_state.exact_x[self.state_index] = value
+
+    # Position before the last simulation tick, used to interpolate drawing
+    @property
+    def previous_x(self):
+        return float(self.race_state.previous_x[self.state_index])
+
+    @property
+    def x(self):
+        return int(self.race_state.exact_x[self.state_index])
+
+    @x.setter
+    def x(self, value):
+        self.race_state.exact_x[self.state_index] = value
+
+    # Logical sprite rect (whole pixels of exact_x)
+    @property
+    def rect(self):
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+    # Where the sprite is drawn (can sit between two simulation ticks)
+    @property
+    def draw_rect(self):
+        return pygame.Rect(int(self.race_state.draw_x[self.state_index]), self.y, self.width, self.height)
+
+    @property
+    def hitbox(self):
+        return pygame.Rect(self.x + self.hitbox_x_offset, self.y + self.hitbox_y_offset,
+                           self.hitbox_width, self.hitbox_height)
+
+    # Read-only snapshot of the slot's stats; change them by assigning a whole dict
+    # (horse.stats = {...}), item assignment raises instead of editing a throwaway copy
+    @property
+    def stats(self):
+        row = self.race_state.stats[self.state_index]
+        return MappingProxyType({name: int(row[column]) for name, column in STAT_COLUMNS.items()})
+
+    @stats.setter
+    def stats(self, stats):
+        self.race_state.set_stats(self.state_index, stats)
+
+    @property
+    def current_frame_index(self):
+        return int(self.race_state.frame_index[self.state_index])
+
+    @property
+    def image(self):
+        if not self.current_animation_frames:
+            return self.static_image
+        return self.current_animation_frames[self.race_state.frame_index[self.state_index] % len(self.current_animation_frames)]
+
+    # Cache key for one of our animation strips at the given sprite size
+    @staticmethod
+    def sprite_cache_key(strip_path, num_frames, horse_sprite_width, horse_sprite_height):
+        return (strip_path, SPRITE_FRAME_WIDTH, SPRITE_FRAME_HEIGHT, num_frames,
+                horse_sprite_width, horse_sprite_height, 0)
+
+    # Decode and scale idle/run strips ahead of time so creating a Horse is cheap.
+    # With an asset_manager the PNGs are decoded on its worker threads instead;
+    # returns the keys to wait for before creating horses.
+    @staticmethod
+    def preload_sprites(sprite_pairs, horse_sprite_width, horse_sprite_height, asset_manager=None):
+        entries = []
+        for idle_path, run_path in sprite_pairs:
+            entries.append(Horse.sprite_cache_key(idle_path, IDLE_FRAME_COUNT, horse_sprite_width, horse_sprite_height))
+            entries.append(Horse.sprite_cache_key(run_path, RUN_FRAME_COUNT, horse_sprite_width, horse_sprite_height))
+        if asset_manager is None:
+            sprite_cache.preload(entries)
+            return []
+
+        keys = []
+        for entry in entries:
+            if sprite_cache.load_from_atlas(entry):
+                continue
+            asset_manager.load(
+                entry,
+                lambda path=entry[0]: pygame.image.load(path),
+                lambda image, entry=entry: sprite_cache.add_sheet(entry, image)
+            )
+            keys.append(entry)
+        return keys
 
     def generate_stats_and_odds(self):
-        self.stats = {
-            "SPEED": random.randint(30, 100),
-            "STAMINA": random.randint(30, 100),
-            "WIT": random.randint(30, 100),
-        }
-        total_stats = sum(self.stats.values())
-        normalized_winrate = (total_stats / 300) ** 1.5 
-        self.winrate_percent = max(10, min(90, normalized_winrate * 100))
-        multiplier_range = 2.0 - 1.1
-        self.multiplier = 1.1 + ((1.0 - normalized_winrate) * multiplier_range)
-        self.multiplier = round(max(1.1, min(2.0, self.multiplier)), 2)
+        stats = roll_stats(self.rng)
+        self.stats = stats
+        self.winrate_percent, self.multiplier = odds_from_stats(stats)
 
+    # Price the horse from its exact win probability (0.0 - 1.0): the displayed chance
+    # and the payout multiplier both replace the stat-based guess
+    def set_win_probability(self, probability):
+        self.winrate_percent = probability * 100
+        self.multiplier = multiplier_from_probability(probability)
+
+    # Single-horse tick (the game steps the whole field at once through RaceState.step)
     def move(self, weather_modifier=1.0):
-        speed_roll = random.randint(1, 3) + int(self.stats["SPEED"] / 20)
-        stamina_roll = random.randint(0, int(self.stats["STAMINA"] / 33))
+        stats = self.stats
+        speed_roll = self.rng.randint(1, 3) + int(stats["SPEED"] / 20)
+        stamina_roll = self.rng.randint(0, int(stats["STAMINA"] / 33))
         # Apply weather modifier and "slow" horse movement
         movement = (speed_roll + stamina_roll) * weather_modifier * 0.15
-        self.exact_x += movement
-        old_x = self.rect.x
-        self.rect.x = int(self.exact_x)
-        # Update hitbox to follow sprite position
-        self.hitbox.x += (self.rect.x - old_x)
+        state, i = self.race_state, self.state_index
+        state.previous_x[i] = state.exact_x[i]
+        state.exact_x[i] += movement
+        state.draw_x[i] = int(state.exact_x[i])
+
+    # Jump straight to a precomputed position (race playback)
+    def set_position(self, exact_x):
+        state, i = self.race_state, self.state_index
+        state.previous_x[i] = state.exact_x[i]
+        state.exact_x[i] = float(exact_x)
+        state.draw_x[i] = int(state.exact_x[i])
+
+    # Place the sprite between the last two simulation ticks (alpha 0.0 - 1.0)
+    def interpolate(self, alpha):
+        state, i = self.race_state, self.state_index
+        state.draw_x[i] = int(state.previous_x[i] + (state.exact_x[i] - state.previous_x[i]) * alpha)
         
     def reset(self):
-        old_x = self.rect.x
-        self.rect.x = self.start_line_x
-        self.exact_x = float(self.start_line_x)
-        # Reset hitbox position
-        self.hitbox.x += (self.rect.x - old_x)
+        self.race_state.reset_positions(self.state_index)
         self.generate_stats_and_odds()
         # Reset animation to IDLE
         self.set_animation_state("IDLE")
@@ -144,31 +251,36 @@ class Horse(GameObject):
         if state == "RUNNING" and self.animation_state != "RUNNING":
             self.animation_state = "RUNNING"
             self.current_animation_frames = self.running_frames
-            self.current_frame_index = 0 
+            self.race_state.set_animation(self.state_index, len(self.current_animation_frames))
         elif state == "IDLE" and self.animation_state != "IDLE":
             self.animation_state = "IDLE"
             self.current_animation_frames = self.idle_frames
-            self.current_frame_index = 0
+            self.race_state.set_animation(self.state_index, len(self.current_animation_frames))
             
     # Override parent update method (gameobject)
     def update(self):
         if not self.current_animation_frames: 
             return 
-            
-        now = pygame.time.get_ticks()
-        if now - self.last_update_time > self.animation_speed_ms: 
-            self.last_update_time = now
-            self.current_frame_index = (self.current_frame_index + 1) % len(self.current_animation_frames)
-            self.image = self.current_animation_frames[self.current_frame_index]
+        self.race_state.update_animation(pygame.time.get_ticks(), self.animation_speed_ms, self.state_index)
 
-    # Override parent draw method (gameobject)
-    def draw(self, surface):
-        surface.blit(self.image, self.rect)
+    # Override parent draw method (gameobject); camera_x: track x at the left edge of the surface
+    def draw(self, surface, camera_x=0):
+        surface.blit(self.image, self.draw_rect.move(-camera_x, 0))
         
-    def get_preview_image(self):
+    def get_preview_image(self, size=None):
         if self.idle_frames:
-            return self.idle_frames[0]
+            preview_image = self.idle_frames[0]
         elif self.current_animation_frames:
-            return self.current_animation_frames[0]
+            preview_image = self.current_animation_frames[0]
         else:
-            return self.image
\ No newline at end of file
+            preview_image = self.image
+        if size is None:
+            return preview_image
+
+        # Scaled previews are built once per size and reused every frame
+        size = tuple(size)
+        cached = self.preview_cache.get(size)
+        if cached is None or cached[0] is not preview_image:
+            cached = (preview_image, pygame.transform.scale(preview_image, size))
+            self.preview_cache[size] = cached
+        return cached[1]
\ No newline at end of file
@@ -0,0 +1,48 @@
+import numpy as np
+import random
+
+# Stat rolls and payout odds for a horse (no pygame, shared with the headless tools)
+STAT_NAMES = ["SPEED", "STAMINA", "WIT"]
+STAT_MIN = 30
+STAT_MAX = 100
+MULTIPLIER_MIN = 1.1
+MULTIPLIER_MAX = 2.0
+# Fields priced from the odds table: a winning bet returns (1 - HOUSE_EDGE) / win probability
+# times the stake in total. The multiplier is the part on top of the returned stake, kept
+# between next to nothing (a near-certain winner) and a long-shot cap.
+HOUSE_EDGE = 0.1
+PRICED_MULTIPLIER_MIN = 0.01
+PRICED_MULTIPLIER_MAX = 50.0
+
+
+# Roll a fresh set of stats
+def roll_stats(rng=random):
+    return {name: rng.randint(STAT_MIN, STAT_MAX) for name in STAT_NAMES}
+
+
+# Stat-based win chance estimate (percent) and payout multiplier
+def odds_from_stats(stats, multiplier_min=MULTIPLIER_MIN, multiplier_max=MULTIPLIER_MAX):
+    total_stats = sum(stats.values())
+    normalized_winrate = (total_stats / (STAT_MAX * len(stats))) ** 1.5 
+    winrate_percent = max(10, min(90, normalized_winrate * 100))
+    multiplier_range = multiplier_max - multiplier_min
+    multiplier = multiplier_min + ((1.0 - normalized_winrate) * multiplier_range)
+    multiplier = round(max(multiplier_min, min(multiplier_max, multiplier)), 2)
+    return winrate_percent, multiplier
+
+
+# Payout multiplier for a horse with a known win probability (0.0 - 1.0)
+def multiplier_from_probability(probability, house_edge=HOUSE_EDGE,
+                                multiplier_min=PRICED_MULTIPLIER_MIN, multiplier_max=PRICED_MULTIPLIER_MAX):
+    if probability <= 0:
+        return multiplier_max
+    return round(max(multiplier_min, min(multiplier_max, (1.0 - house_edge) / probability - 1.0)), 2)
+
+
+# multiplier_from_probability for a whole array of probabilities
+def multipliers_from_probabilities(probabilities, house_edge=HOUSE_EDGE,
+                                   multiplier_min=PRICED_MULTIPLIER_MIN, multiplier_max=PRICED_MULTIPLIER_MAX):
+    probabilities = np.asarray(probabilities, dtype=float)
+    with np.errstate(divide="ignore"):
+        multipliers = np.clip((1.0 - house_edge) / probabilities - 1.0, multiplier_min, multiplier_max)
+    return np.where(probabilities <= 0, multiplier_max, np.round(multipliers, 2))
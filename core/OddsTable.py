@@ -0,0 +1,233 @@
+import numpy as np
+import json
+import time
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.RaceSimulator import (
+    RaceSimulator, win_probabilities_from_finished,
+    SPEED_ROLL_MIN, SPEED_ROLL_MAX, SPEED_BONUS_DIVISOR, STAMINA_ROLL_DIVISOR, MOVE_SCALE
+)
+from core.HorseStats import STAT_MIN, STAT_MAX
+from core.Weather import PERFORMANCE_MODIFIERS
+from core.Settings import START_LINE_X, FINISH_LINE_X, FINISH_LINE_OVERSHOOT, HORSE_SPRITE_WIDTH
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ODDS_DIR = os.path.join(PROJECT_ROOT, "Assets", "odds")
+# The game's logic finish line (see GameManager.actual_finish_line_x)
+GAME_FINISH_LINE_X = FINISH_LINE_X + FINISH_LINE_OVERSHOOT
+# Fields priced together by field_win_probabilities (fewer ticks per group vs. more Python loops)
+FIELD_GROUP_SIZE = 32
+
+
+def odds_table_path(distance):
+    return os.path.join(ODDS_DIR, f"finish_ticks_{distance}.json")
+
+
+# Everything the finish distributions depend on; a table built under other rules is stale
+def _rules(distance):
+    return {
+        "distance": distance,
+        "speed_roll": [SPEED_ROLL_MIN, SPEED_ROLL_MAX],
+        "speed_bonus_divisor": SPEED_BONUS_DIVISOR,
+        "stamina_roll_divisor": STAMINA_ROLL_DIVISOR,
+        "move_scale": MOVE_SCALE,
+        "modifiers": list(PERFORMANCE_MODIFIERS),
+        "stat_range": [STAT_MIN, STAT_MAX],
+    }
+
+
+# OddsTable - prices a whole field with array lookups instead of simulating it.
+# A horse's race only depends on its class: SPEED // SPEED_BONUS_DIVISOR,
+# STAMINA // STAMINA_ROLL_DIVISOR and its weather modifier (60 classes for the
+# game's stat range). The offline build step stores every class's finishing-tick
+# CDF in one .npy; the game memory-maps it, gathers one row per horse and combines
+# them with the same exact formula as RaceSimulator.exact_win_probabilities,
+# so any field size and order is priced exactly, with no simulation.
+# A missing or stale table falls back to computing the distributions at runtime
+# until build() has made one for this distance (the game runs it on the asset loader).
+class OddsTable:
+    def __init__(self, start_line_x=START_LINE_X, finish_line_x=GAME_FINISH_LINE_X, horse_sprite_width=HORSE_SPRITE_WIDTH):
+        # Fallback for fields the table can't price
+        self.simulator = RaceSimulator(start_line_x, finish_line_x, horse_sprite_width)
+        self.distance = self.simulator.distance
+        self.modifier_index = {modifier: i for i, modifier in enumerate(PERFORMANCE_MODIFIERS)}
+        # finished[speed class, stamina class, modifier, tick] = P(finished by that tick)
+        self.finished = None
+        self.first_ticks = None
+        self.end_ticks = None
+        self.speed_bonus_min = 0
+        self.stamina_max_min = 0
+        self.load_attempted = False
+        # All CDFs on one axis for sample_finish_ticks, rebuilt when the table changes
+        self.stacked = None
+        self.stacked_source = None
+
+    # Memory-map the table; returns False (and keeps using the fallback) if it's missing or stale
+    def load(self, path=None):
+        self.load_attempted = True
+        path = path or odds_table_path(self.distance)
+        try:
+            with open(path) as index_file:
+                index = json.load(index_file)
+            if index["rules"] != _rules(self.distance):
+                print(f"Warning: Odds table {path} was built for other race rules, rebuild it with python -m core.OddsTable")
+                return False
+            finished = np.load(os.path.join(os.path.dirname(path), index["table"]), mmap_mode="r")
+            self.first_ticks = np.array(index["first_ticks"])
+            self.end_ticks = np.array(index["end_ticks"])
+            self.speed_bonus_min = index["speed_bonus_min"]
+            self.stamina_max_min = index["stamina_max_min"]
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Could not load odds table {path}: {e}")
+            return False
+        # Set last: build() may load from a worker thread while the game prices fields
+        self.finished = finished
+        return True
+
+    # Build the table for this distance, save it for the next launch and switch to it.
+    # Slow on long tracks (every class's distribution), so the game runs it on the asset loader.
+    def build(self):
+        path = build_odds_table(self.simulator.start_line_x, self.simulator.finish_line_x, self.simulator.horse_sprite_width)
+        self.load(path)
+        return path
+
+    def is_loaded(self):
+        if not self.load_attempted:
+            self.load()
+        return self.finished is not None
+
+    # Table indices of every horse, or None if one of them falls outside the table
+    def _classes(self, speeds, staminas, weather_modifiers):
+        speed_index = np.asarray(speeds, dtype=np.int64) // SPEED_BONUS_DIVISOR - self.speed_bonus_min
+        stamina_index = np.asarray(staminas, dtype=np.int64) // STAMINA_ROLL_DIVISOR - self.stamina_max_min
+        if (speed_index.min() < 0 or speed_index.max() >= self.finished.shape[0]
+                or stamina_index.min() < 0 or stamina_index.max() >= self.finished.shape[1]):
+            return None
+        modifier_index = [self.modifier_index.get(float(modifier)) for modifier in weather_modifiers]
+        if None in modifier_index:
+            return None
+        return speed_index, stamina_index, np.array(modifier_index)
+
+    # Exact win probability for every horse (same numbers as RaceSimulator.exact_win_probabilities)
+    def win_probabilities(self, speeds, staminas, weather_modifiers):
+        classes = self._classes(speeds, staminas, weather_modifiers) if self.is_loaded() else None
+        if classes is None:
+            return self.simulator.exact_win_probabilities(speeds, staminas, weather_modifiers)
+        # Only read the ticks where somebody in this field can finish
+        first = self.first_ticks[classes].min()
+        last = self.end_ticks[classes].max()
+        return win_probabilities_from_finished(self.finished[classes[0], classes[1], classes[2], first - 1:last])
+
+    # Table indices for (fields, horses) arrays of stats and PERFORMANCE_MODIFIERS indices
+    def field_classes(self, speeds, staminas, modifier_indices):
+        return (np.asarray(speeds) // SPEED_BONUS_DIVISOR - self.speed_bonus_min,
+                np.asarray(staminas) // STAMINA_ROLL_DIVISOR - self.stamina_max_min,
+                np.asarray(modifier_indices))
+
+    # win_probabilities for a whole batch of fields at once (see field_classes); empty slots
+    # (present False) never finish and get 0. A field is decided by the tick one of its horses
+    # is certain to have finished, so fields are sorted by that tick and priced in groups,
+    # each over its own tick window. Needs a loaded table.
+    def field_win_probabilities(self, classes, present, group_size=FIELD_GROUP_SIZE):
+        never = self.end_ticks.max() + 1
+        firsts = np.where(present, self.first_ticks[classes], never).min(axis=1)
+        lasts = np.where(present, self.end_ticks[classes], never).min(axis=1)
+        order = np.argsort(lasts)
+        finished = np.asarray(self.finished)
+        probabilities = np.zeros(present.shape)
+        for start in range(0, len(order), group_size):
+            group = order[start:start + group_size]
+            first, last = firsts[group].min(), lasts[group].max()
+            # running[horse, field, tick] = P(still running after that tick)
+            running = 1.0 - finished[classes[0][group].T, classes[1][group].T, classes[2][group].T, first - 1:last + 1]
+            running[~present[group].T] = 1.0
+            finishes_at = running[:, :, :-1] - running[:, :, 1:]
+            # Same formula as win_probabilities_from_finished, with the products over the
+            # horses ahead (still running after t) and behind (still running before t) carried along
+            ahead = np.ones(finishes_at.shape[1:])
+            aheads = []
+            for horse in range(len(running)):
+                aheads.append(ahead)
+                ahead = ahead * running[horse, :, 1:]
+            behind = np.ones(finishes_at.shape[1:])
+            for horse in reversed(range(len(running))):
+                probabilities[group, horse] = (finishes_at[horse] * aheads[horse] * behind).sum(axis=1)
+                behind = behind * running[horse, :, :-1]
+        return probabilities
+
+    # Sample every horse's finishing tick (an index on the table's tick axis) from uniforms in [0, 1).
+    # Each class's CDF is stored offset by its class number, so one sorted array covers them all.
+    def sample_finish_ticks(self, classes, uniforms):
+        if self.stacked_source is not self.finished:
+            rows = np.asarray(self.finished).reshape(-1, self.finished.shape[-1])
+            self.stacked = (rows + np.arange(len(rows))[:, None]).ravel()
+            self.stacked_source = self.finished
+        width = self.finished.shape[-1]
+        class_ids = np.ravel_multi_index(classes, self.finished.shape[:-1])
+        return np.searchsorted(self.stacked, class_ids + uniforms, side="right") - class_ids * width
+
+    # Drop-in for RaceSimulator.estimate_field (list of Horse objects and a Weather object)
+    def estimate_field(self, horses, weather):
+        speeds = [horse.stats["SPEED"] for horse in horses]
+        staminas = [horse.stats["STAMINA"] for horse in horses]
+        modifiers = [weather.get_performance_modifier(horse.weather_preference) for horse in horses]
+        return self.win_probabilities(speeds, staminas, modifiers)
+
+
+# Offline build step: every class's finishing-tick CDF on one tick axis, written to
+# Assets/odds/finish_ticks_<distance>.npy with a JSON index next to it
+def build_odds_table(start_line_x=START_LINE_X, finish_line_x=GAME_FINISH_LINE_X, horse_sprite_width=HORSE_SPRITE_WIDTH):
+    simulator = RaceSimulator(start_line_x, finish_line_x, horse_sprite_width)
+    speed_bonuses = range(STAT_MIN // SPEED_BONUS_DIVISOR, STAT_MAX // SPEED_BONUS_DIVISOR + 1)
+    stamina_maxes = range(STAT_MIN // STAMINA_ROLL_DIVISOR, STAT_MAX // STAMINA_ROLL_DIVISOR + 1)
+
+    distributions = {}
+    for i, speed_bonus in enumerate(speed_bonuses):
+        for j, stamina_max in enumerate(stamina_maxes):
+            for k, modifier in enumerate(PERFORMANCE_MODIFIERS):
+                distributions[i, j, k] = simulator.finish_tick_distribution(
+                    speed_bonus * SPEED_BONUS_DIVISOR, stamina_max * STAMINA_ROLL_DIVISOR, modifier)
+
+    shape = (len(speed_bonuses), len(stamina_maxes), len(PERFORMANCE_MODIFIERS))
+    width = max(first_tick + len(cdf) for first_tick, cdf in distributions.values())
+    finished = np.ones(shape + (width,))
+    first_ticks = np.empty(shape, dtype=np.int64)
+    end_ticks = np.empty(shape, dtype=np.int64)
+    for key, (first_tick, cdf) in distributions.items():
+        finished[key][:first_tick] = 0.0
+        finished[key][first_tick:first_tick + len(cdf)] = cdf
+        first_ticks[key] = first_tick
+        end_ticks[key] = first_tick + len(cdf)
+
+    index_path = odds_table_path(simulator.distance)
+    table_name = os.path.splitext(os.path.basename(index_path))[0] + ".npy"
+    table_path = os.path.join(ODDS_DIR, table_name)
+    os.makedirs(ODDS_DIR, exist_ok=True)
+    # Write to temp files and swap them in, so a game loading the table never sees half of it
+    with open(table_path + ".tmp", "wb") as table_file:
+        np.save(table_file, finished)
+    os.replace(table_path + ".tmp", table_path)
+    with open(index_path + ".tmp", "w") as index_file:
+        json.dump({
+            "table": table_name,
+            "rules": _rules(simulator.distance),
+            "speed_bonus_min": speed_bonuses[0],
+            "stamina_max_min": stamina_maxes[0],
+            "first_ticks": first_ticks.tolist(),
+            "end_ticks": end_ticks.tolist(),
+        }, index_file, indent=2)
+    os.replace(index_path + ".tmp", index_path)
+    return index_path
+
+
+odds_table = OddsTable()
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    path = build_odds_table()
+    print(f"Wrote {path} in {(time.perf_counter() - start) * 1000:.0f} ms")
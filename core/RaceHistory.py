@@ -0,0 +1,276 @@
+import sqlite3
+import threading
+import queue
+import time
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.HorseStats import STAT_NAMES
+
+# Records are written in batches of up to this many, or after this long, whichever comes first
+HISTORY_BATCH_SIZE = 500
+HISTORY_FLUSH_SECONDS = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS races (
+    id INTEGER PRIMARY KEY,
+    recorded_at REAL NOT NULL,
+    session_seed TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    weather TEXT NOT NULL,
+    field_size INTEGER NOT NULL,
+    winner_slot INTEGER NOT NULL,
+    bet_slot INTEGER NOT NULL,
+    bet_amount INTEGER NOT NULL,
+    payout INTEGER NOT NULL,
+    cash_after INTEGER NOT NULL,
+    -- Running totals up to and including this race, over the whole log and within the session
+    total_bet INTEGER NOT NULL,
+    total_payout INTEGER NOT NULL,
+    session_bet INTEGER NOT NULL,
+    session_payout INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    race_id INTEGER NOT NULL,
+    slot INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    speed INTEGER NOT NULL,
+    stamina INTEGER NOT NULL,
+    wit INTEGER NOT NULL,
+    weather_preference TEXT NOT NULL,
+    winrate_percent REAL NOT NULL,
+    multiplier REAL NOT NULL,
+    won INTEGER NOT NULL,
+    PRIMARY KEY (race_id, slot)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS races_by_session ON races (session_seed, id);
+CREATE TABLE IF NOT EXISTS replays (
+    race_id INTEGER PRIMARY KEY,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS stat_totals (
+    stat TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    entries INTEGER NOT NULL,
+    wins INTEGER NOT NULL,
+    PRIMARY KEY (stat, value)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS weather_totals (
+    weather TEXT PRIMARY KEY,
+    races INTEGER NOT NULL,
+    bet_amount INTEGER NOT NULL,
+    payout INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+# Queued behind pending records; the writer sets done once they are written
+class _FlushRequest:
+    def __init__(self, stop=False):
+        self.done = threading.Event()
+        self.stop = stop
+
+
+# RaceHistory - append-only log of every race in SQLite.
+# record_race() only queues a tuple; a writer thread inserts them in batches,
+# so the frame never touches the disk. Queries run on their own connection
+# (WAL mode lets them read while the writer appends). The writer also keeps
+# running totals per stat value and per weather, so the analytical queries
+# read a few hundred rows instead of scanning every race.
+class RaceHistory:
+    def __init__(self, path, batch_size=HISTORY_BATCH_SIZE, flush_seconds=HISTORY_FLUSH_SECONDS):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.queue = queue.Queue()
+        self.recorded = 0
+
+        # Create the schema up front so queries work before the first write
+        connection = self._connect()
+        connection.executescript(_SCHEMA)
+        connection.commit()
+        connection.close()
+
+        self.query_connection = None
+        self.writer = threading.Thread(target=self._write_loop, name="race-history", daemon=True)
+        self.writer.start()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    # Queue one finished race. field: list of dicts with name, stats, weather_preference,
+    # winrate_percent, multiplier (in field order); replay: encoded RaceReplay bytes or None.
+    # Cheap enough to call from the frame.
+    def record_race(self, session_seed, day, weather, field, winner_slot, bet_slot, bet_amount, payout, cash_after,
+                    replay=None):
+        race = (time.time(), str(session_seed), day, weather, len(field), winner_slot, bet_slot,
+                int(bet_amount), int(payout), int(cash_after))
+        entries = [
+            (slot, horse["name"], *(horse["stats"][name] for name in STAT_NAMES), horse["weather_preference"],
+             float(horse["winrate_percent"]), float(horse["multiplier"]), int(slot == winner_slot))
+            for slot, horse in enumerate(field)
+        ]
+        self.queue.put((race, entries, replay))
+        self.recorded += 1
+
+    #  Writer thread
+    def _write_loop(self):
+        connection = self._connect()
+        # Running totals carry on from whatever is already in the log
+        row = connection.execute("SELECT total_bet, total_payout FROM races ORDER BY id DESC LIMIT 1").fetchone()
+        self.totals = list(row) if row else [0, 0]
+        self.session_totals = {}
+        batch = []
+        deadline = None
+        running = True
+        while running:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            request = item if isinstance(item, _FlushRequest) else None
+            if item is not None and request is None:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_seconds
+            # Write on a full batch, when the batch is old enough, or when someone is waiting
+            if batch and (item is None or request or len(batch) >= self.batch_size):
+                self._write_batch(connection, batch)
+                batch = []
+                deadline = None
+            if request:
+                request.done.set()
+                running = not request.stop
+        connection.close()
+
+    # Running totals of a session so far (looked up once, then kept in memory)
+    def _session_totals(self, connection, session_seed):
+        if session_seed not in self.session_totals:
+            row = connection.execute(
+                "SELECT session_bet, session_payout FROM races WHERE session_seed = ? ORDER BY id DESC LIMIT 1",
+                (session_seed,)).fetchone()
+            self.session_totals[session_seed] = tuple(row) if row else (0, 0)
+        return self.session_totals[session_seed]
+
+    def _write_batch(self, connection, batch):
+        # Totals for this batch: (stat, value) -> [entries, wins], weather -> [races, bet, payout]
+        stat_totals = {}
+        weather_totals = {}
+        # Running totals only move forward once the batch is committed
+        total_bet, total_payout = self.totals
+        session_totals = {}
+        races = []
+        for race, entries, replay in batch:
+            session_seed, bet, payout = race[1], race[7], race[8]
+            session_bet, session_payout = session_totals.get(session_seed) or self._session_totals(connection, session_seed)
+            total_bet += bet
+            total_payout += payout
+            session_totals[session_seed] = (session_bet + bet, session_payout + payout)
+            races.append((race + (total_bet, total_payout) + session_totals[session_seed], entries, replay))
+
+            totals = weather_totals.setdefault(race[3], [0, 0, 0])
+            totals[0] += 1
+            totals[1] += bet
+            totals[2] += payout
+            for entry in entries:
+                won = entry[-1]
+                for offset, name in enumerate(STAT_NAMES):
+                    totals = stat_totals.setdefault((name, entry[2 + offset]), [0, 0])
+                    totals[0] += 1
+                    totals[1] += won
+        try:
+            with connection:
+                for race, entries, replay in races:
+                    cursor = connection.execute(
+                        "INSERT INTO races (recorded_at, session_seed, day, weather, field_size, winner_slot,"
+                        " bet_slot, bet_amount, payout, cash_after, total_bet, total_payout, session_bet,"
+                        " session_payout) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", race)
+                    race_id = cursor.lastrowid
+                    connection.executemany(
+                        "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        [(race_id, *entry) for entry in entries])
+                    if replay is not None:
+                        connection.execute("INSERT INTO replays VALUES (?, ?)", (race_id, replay))
+                connection.executemany(
+                    "INSERT INTO stat_totals VALUES (?, ?, ?, ?) ON CONFLICT (stat, value) DO UPDATE SET"
+                    " entries = entries + excluded.entries, wins = wins + excluded.wins",
+                    [(*key, *totals) for key, totals in stat_totals.items()])
+                connection.executemany(
+                    "INSERT INTO weather_totals VALUES (?, ?, ?, ?) ON CONFLICT (weather) DO UPDATE SET"
+                    " races = races + excluded.races, bet_amount = bet_amount + excluded.bet_amount,"
+                    " payout = payout + excluded.payout",
+                    [(weather, *totals) for weather, totals in weather_totals.items()])
+        except sqlite3.Error as e:
+            print(f"Warning: Could not write race history to {self.path}: {e}")
+            return
+        self.totals = [total_bet, total_payout]
+        self.session_totals.update(session_totals)
+
+    # Block until everything queued so far is in the database
+    def flush(self, stop=False):
+        request = _FlushRequest(stop)
+        self.queue.put(request)
+        request.done.wait()
+
+    # Flush and stop the writer thread
+    def close(self):
+        if self.writer.is_alive():
+            self.flush(stop=True)
+        if self.query_connection:
+            self.query_connection.close()
+            self.query_connection = None
+
+    #  Queries
+    def _query(self, sql, params=()):
+        if self.query_connection is None:
+            self.query_connection = self._connect()
+        return self.query_connection.execute(sql, params).fetchall()
+
+    # Encoded replay of a race (see core/RaceReplay.py), or None if it wasn't recorded
+    def get_replay(self, race_id):
+        rows = self._query("SELECT data FROM replays WHERE race_id = ?", (race_id,))
+        return rows[0][0] if rows else None
+
+    def race_count(self):
+        return self._query("SELECT COUNT(*) FROM races")[0][0]
+
+    # How often horses win by stat value: [(bucket start, entries, wins, win rate)]
+    def win_rate_by_stat(self, stat="SPEED", bucket_size=10):
+        if stat not in STAT_NAMES:
+            raise ValueError(f"unknown stat {stat!r}")
+        rows = self._query(
+            "SELECT (value / ?) * ?, SUM(entries), SUM(wins) FROM stat_totals WHERE stat = ?"
+            " GROUP BY value / ? ORDER BY value / ?",
+            (bucket_size, bucket_size, stat, bucket_size, bucket_size))
+        return [(bucket, count, wins, wins / count) for bucket, count, wins in rows]
+
+    # House edge per weather: [(weather, races, total bet, total payout, edge)]
+    # edge = 1 - payout / bet, i.e. the share of every bet the house keeps
+    def house_edge_by_weather(self):
+        rows = self._query(
+            "SELECT weather, races, bet_amount, payout FROM weather_totals ORDER BY weather")
+        return [(weather, races, bet, payout, 1.0 - payout / bet if bet else 0.0)
+                for weather, races, bet, payout in rows]
+
+    # Player return on investment race by race, over one session or the whole log:
+    # [(race id, day, bet, payout, cumulative bet, cumulative payout, cumulative ROI)]
+    # every: keep only every Nth race of the whole log (long histories plot fine with a few thousand points)
+    def roi_over_time(self, session_seed=None, every=1):
+        if session_seed is not None:
+            rows = self._query(
+                "SELECT id, day, bet_amount, payout, session_bet, session_payout FROM races"
+                " WHERE session_seed = ? AND id % ? = 0 ORDER BY id", (str(session_seed), every))
+        else:
+            rows = self._query(
+                "SELECT id, day, bet_amount, payout, total_bet, total_payout FROM races"
+                " WHERE id % ? = 0 ORDER BY id", (every,))
+        return [(race_id, day, bet, payout, total_bet, total_payout,
+                 (total_payout - total_bet) / total_bet if total_bet else 0.0)
+                for race_id, day, bet, payout, total_bet, total_payout in rows]
@@ -0,0 +1,126 @@
+import numpy as np
+import struct
+import zlib
+
+# File layout: magic, format version, ticks, horses, winner index, then the zlib'd
+# per-tick deltas. Bump REPLAY_VERSION whenever the layout changes.
+REPLAY_MAGIC = b"CHRP"
+REPLAY_VERSION = 2
+# Fast-forward speeds the viewer offers
+REPLAY_SPEEDS = (1, 2, 4, 8)
+
+# magic, version, ticks, horses, winner index
+_HEADER = struct.Struct("<4sHIII")
+
+
+class ReplayError(Exception):
+    pass
+
+
+# RaceReplay - every tick of one race: positions[tick, horse] (drawn x) and
+# frames[tick, horse] (animation frame). Row 0 is the start line.
+class RaceReplay:
+    def __init__(self, positions, frames, winner_index):
+        self.positions = np.asarray(positions, dtype=np.int64)
+        self.frames = np.asarray(frames, dtype=np.int64)
+        self.winner_index = winner_index
+
+    @property
+    def tick_count(self):
+        return len(self.positions)
+
+    @property
+    def horse_count(self):
+        return self.positions.shape[1]
+
+
+# Collects a RaceReplay tick by tick while a race runs (one row copy per tick)
+class RaceRecorder:
+    def __init__(self, race_state):
+        self.race_state = race_state
+        self.positions = []
+        self.frames = []
+
+    def record(self):
+        self.positions.append(self.race_state.exact_x.astype(np.int64))
+        self.frames.append(self.race_state.frame_index.copy())
+
+    def finish(self, winner_index):
+        return RaceReplay(self.positions, self.frames, winner_index)
+
+
+# RaceReplay -> bytes. Positions and frames barely change from one tick to the
+# next, so each tick is stored as its difference from the previous one (mostly
+# 0s and 1s), which zlib squeezes down to a few KB per race.
+def encode_replay(replay):
+    stream = np.concatenate((replay.positions, replay.frames), axis=1)
+    deltas = np.diff(stream, axis=0, prepend=np.zeros((1, stream.shape[1]), dtype=np.int64))
+    header = _HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, replay.tick_count, replay.horse_count, replay.winner_index)
+    return header + zlib.compress(deltas.astype("<i2").tobytes(), 9)
+
+
+# bytes -> RaceReplay; raises ReplayError if the data is damaged or from another version
+def decode_replay(data):
+    if len(data) < _HEADER.size:
+        raise ReplayError("replay is truncated")
+    magic, version, ticks, horses, winner_index = _HEADER.unpack_from(data)
+    if magic != REPLAY_MAGIC:
+        raise ReplayError("not a race replay")
+    if version != REPLAY_VERSION:
+        raise ReplayError(f"unsupported replay version {version}")
+    try:
+        deltas = np.frombuffer(zlib.decompress(data[_HEADER.size:]), dtype="<i2")
+    except zlib.error as e:
+        raise ReplayError(f"replay is corrupt ({e})")
+    if deltas.size != ticks * horses * 2:
+        raise ReplayError("replay is corrupt (wrong length)")
+    # Decoding everything up front makes every seek a plain row lookup
+    stream = np.cumsum(deltas.reshape(ticks, horses * 2).astype(np.int64), axis=0)
+    return RaceReplay(stream[:, :horses], stream[:, horses:], winner_index)
+
+
+# ReplayPlayer - plays a RaceReplay back onto a RaceState. Nothing is simulated:
+# every frame is a lookup of the recorded tick (blended with the next one for
+# smooth motion), so seeking anywhere is instant.
+class ReplayPlayer:
+    # tick_ms: real time one recorded tick lasts at 1x
+    def __init__(self, replay, tick_ms):
+        self.replay = replay
+        self.tick_ms = tick_ms
+        self.last_tick = replay.tick_count - 1
+        self.tick = 0.0
+        self.speed = 1
+        self.paused = False
+
+    def update(self, elapsed_ms):
+        if not self.paused:
+            self.seek(self.tick + elapsed_ms * self.speed / self.tick_ms)
+
+    def seek(self, tick):
+        self.tick = float(max(0, min(self.last_tick, tick)))
+
+    # Frame stepping: pause and move a whole number of ticks
+    def step(self, ticks):
+        self.paused = True
+        self.seek(int(self.tick) + ticks)
+
+    def set_speed(self, speed):
+        self.speed = speed
+
+    # Pause or resume (resuming at the end starts over)
+    def toggle_pause(self):
+        if self.paused and self.is_finished():
+            self.seek(0)
+        self.paused = not self.paused
+
+    def is_finished(self):
+        return self.tick >= self.last_tick
+
+    # Put the field where it was at the current tick
+    def apply(self, race_state):
+        tick = int(self.tick)
+        next_tick = min(tick + 1, self.last_tick)
+        race_state.previous_x[:] = self.replay.positions[tick]
+        race_state.exact_x[:] = self.replay.positions[next_tick]
+        race_state.interpolate(self.tick - tick)
+        race_state.frame_index[:] = self.replay.frames[tick]
@@ -0,0 +1,222 @@
+import numpy as np
+import math
+import sys
+import os
+from functools import lru_cache
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Movement rules (must match Horse.move)
+SPEED_ROLL_MIN = 1
+SPEED_ROLL_MAX = 3
+SPEED_BONUS_DIVISOR = 20
+STAMINA_ROLL_DIVISOR = 33
+MOVE_SCALE = 0.15
+
+# Ticks generated per batch when precomputing a single race
+RACE_CHUNK_TICKS = 512
+
+# Probability mass left over when we stop stepping a finish distribution
+CDF_EPSILON = 1e-12
+# Mass so far behind the finish that it can't move the CDF; trimmed every tick so long
+# tracks only convolve the band of positions still in play instead of the whole distance
+NEGLIGIBLE_MASS = 1e-18
+# Rounding error of the FFT in _sum_pmf (absolute probability, the pmf sums to 1)
+FFT_NOISE = 1e-13
+
+
+# Step distribution of one Horse.move call, indexed by distance in "roll units"
+def _step_pmf(speed_bonus, stamina_max):
+    pmf = np.zeros(SPEED_ROLL_MAX + speed_bonus + stamina_max + 1)
+    weight = 1.0 / ((SPEED_ROLL_MAX - SPEED_ROLL_MIN + 1) * (stamina_max + 1))
+    for speed_roll in range(SPEED_ROLL_MIN, SPEED_ROLL_MAX + 1):
+        for stamina_roll in range(stamina_max + 1):
+            pmf[speed_roll + speed_bonus + stamina_roll] += weight
+    return pmf
+
+
+# Distribution of the sum of n independent steps (FFT convolution power)
+def _sum_pmf(step_pmf, n):
+    if n == 0:
+        return np.array([1.0])
+    length = (len(step_pmf) - 1) * n + 1
+    fft_size = 1 << (length - 1).bit_length()
+    spectrum = np.fft.rfft(step_pmf, fft_size)
+    pmf = np.fft.irfft(spectrum ** n, fft_size)[:length]
+    # Negative lobes and rounding noise are not probability mass
+    pmf[pmf < FFT_NOISE] = 0.0
+    return pmf / pmf.sum()
+
+
+# Per-horse finishing tick distribution.
+# A horse only depends on (speed bonus, stamina roll max, weather modifier), so
+# there are only a few dozen distinct ones and each is built once per process.
+@lru_cache(maxsize=256)
+def _finish_tick_cdf(speed_bonus, stamina_max, weather_modifier, distance):
+    step_pmf = _step_pmf(speed_bonus, stamina_max)
+    unit = weather_modifier * MOVE_SCALE
+
+    # Smallest number of roll units that covers the distance
+    threshold = math.ceil(distance / unit)
+    while threshold > 1 and (threshold - 1) * unit >= distance:
+        threshold -= 1
+    while threshold * unit < distance:
+        threshold += 1
+
+    # Skip straight past the ticks where no horse could possibly have finished
+    max_step = len(step_pmf) - 1
+    first_safe_ticks = (threshold - 1) // max_step
+    alive = _sum_pmf(step_pmf, first_safe_ticks)[:threshold]
+    # alive[i] is the chance of standing on roll unit offset + i
+    offset = 0
+
+    # Then step tick by tick, keeping only the mass that has not crossed yet
+    cdf = []
+    remaining = 1.0
+    while remaining > CDF_EPSILON:
+        trim = np.searchsorted(np.cumsum(alive), NEGLIGIBLE_MASS)
+        alive = alive[trim:]
+        offset += trim
+        alive = np.convolve(alive, step_pmf)[:threshold - offset]
+        remaining = alive.sum()
+        cdf.append(1.0 - remaining)
+    cdf = np.array(cdf)
+    cdf[-1] = 1.0
+    # Tick numbers are 1-based: the horse crosses on tick first_tick + index
+    return first_safe_ticks + 1, cdf
+
+
+# Exact win probability of every horse in a field from finished[h, i], the chance that
+# horse h (in field order) has finished by tick first - 1 + i of a window covering every finish.
+# P(h wins) = sum over ticks t of P(h finishes at t) * P(earlier horses finish after t)
+#             * P(later horses finish at t or after), matching the update_race tie rule.
+def win_probabilities_from_finished(finished):
+    finishes_at = np.diff(finished, axis=1)
+    after = 1.0 - finished[:, 1:]        # still running after tick t
+    at_or_after = 1.0 - finished[:, :-1]  # still running before tick t
+    probabilities = np.empty(len(finished))
+    for i in range(len(finished)):
+        chance = finishes_at[i].copy()
+        if i > 0:
+            chance *= np.prod(after[:i], axis=0)
+        if i + 1 < len(finished):
+            chance *= np.prod(at_or_after[i + 1:], axis=0)
+        probabilities[i] = chance.sum()
+    return probabilities
+
+
+# Headless Monte Carlo race simulator (no pygame needed)
+class RaceSimulator:
+    def __init__(self, start_line_x=40, finish_line_x=770, horse_sprite_width=64, trials=20000, seed=None):
+        self.start_line_x = start_line_x
+        self.finish_line_x = finish_line_x
+        self.horse_sprite_width = horse_sprite_width
+        self.trials = trials
+        self.rng = np.random.default_rng(seed)
+        # Horse wins once rect.right reaches the (logic) finish line
+        self.distance = (finish_line_x - horse_sprite_width) - start_line_x
+
+    # Restart the random stream (used to make estimates reproducible per day)
+    def reseed(self, seed):
+        self.rng = np.random.default_rng(seed)
+
+    # Finishing tick distribution for a single horse
+    def finish_tick_distribution(self, speed, stamina, weather_modifier=1.0):
+        return _finish_tick_cdf(
+            int(speed / SPEED_BONUS_DIVISOR),
+            int(stamina / STAMINA_ROLL_DIVISOR),
+            float(weather_modifier),
+            self.distance
+        )
+
+    # Run many races at once; returns finishing tick per (trial, horse)
+    def simulate_finish_ticks(self, speeds, staminas, weather_modifiers, trials=None):
+        trials = trials or self.trials
+        num_horses = len(speeds)
+        uniforms = self.rng.random((trials, num_horses))
+        finish_ticks = np.empty((trials, num_horses), dtype=np.int32)
+        for i in range(num_horses):
+            first_tick, cdf = self.finish_tick_distribution(speeds[i], staminas[i], weather_modifiers[i])
+            finish_ticks[:, i] = first_tick + np.searchsorted(cdf, uniforms[:, i], side="right")
+        return finish_ticks
+
+    # Winner index per trial (ties go to the earlier horse, same as update_race)
+    def simulate_winners(self, speeds, staminas, weather_modifiers, trials=None):
+        finish_ticks = self.simulate_finish_ticks(speeds, staminas, weather_modifiers, trials)
+        return np.argmin(finish_ticks, axis=1)
+
+    # Empirical win probability for every horse in the field
+    def win_probabilities(self, speeds, staminas, weather_modifiers, trials=None):
+        winners = self.simulate_winners(speeds, staminas, weather_modifiers, trials)
+        return np.bincount(winners, minlength=len(speeds)) / len(winners)
+
+    # Exact win probability for every horse (no sampling, see win_probabilities_from_finished)
+    def exact_win_probabilities(self, speeds, staminas, weather_modifiers):
+        distributions = [self.finish_tick_distribution(speed, stamina, modifier)
+                         for speed, stamina, modifier in zip(speeds, staminas, weather_modifiers)]
+        first = min(first_tick for first_tick, _ in distributions)
+        last = max(first_tick + len(cdf) for first_tick, cdf in distributions)
+        # finished[h, i] = P(horse h has finished by tick first - 1 + i)
+        finished = np.ones((len(distributions), last - first + 1))
+        for i, (first_tick, cdf) in enumerate(distributions):
+            offset = first_tick - first + 1
+            finished[i, :offset] = 0.0
+            finished[i, offset:offset + len(cdf)] = cdf
+        return win_probabilities_from_finished(finished)
+
+    # Precompute one full race in a single vectorized pass.
+    # Returns (positions, winner): positions[tick, horse] is exact_x after that tick
+    # (row 0 is the start line) and winner is the index of the first horse to finish.
+    # Follows update_race exactly: same float steps, ties go to the earlier horse,
+    # and horses after the winner don't move on the final tick.
+    def simulate_race(self, speeds, staminas, weather_modifiers, seed=None):
+        rng = np.random.default_rng(seed) if seed is not None else self.rng
+        speed_bonus = np.array([int(speed / SPEED_BONUS_DIVISOR) for speed in speeds])
+        stamina_max = np.array([int(stamina / STAMINA_ROLL_DIVISOR) for stamina in staminas])
+        modifiers = np.array(weather_modifiers, dtype=np.float64)
+        num_horses = len(speeds)
+        finish_x = self.start_line_x + self.distance
+
+        chunks = [np.full((1, num_horses), float(self.start_line_x))]
+        while True:
+            speed_rolls = rng.integers(SPEED_ROLL_MIN, SPEED_ROLL_MAX + 1, (RACE_CHUNK_TICKS, num_horses)) + speed_bonus
+            stamina_rolls = rng.integers(0, stamina_max + 1, (RACE_CHUNK_TICKS, num_horses))
+            movement = (speed_rolls + stamina_rolls) * modifiers * MOVE_SCALE
+            # cumsum adds sequentially, so this matches exact_x += movement bit for bit
+            movement[0] += chunks[-1][-1]
+            positions = np.cumsum(movement, axis=0)
+            crossed = np.floor(positions) >= finish_x
+            finished_ticks = np.flatnonzero(crossed.any(axis=1))
+            if finished_ticks.size == 0:
+                chunks.append(positions)
+                continue
+            last = finished_ticks[0]
+            winner = int(np.argmax(crossed[last]))
+            positions = positions[:last + 1]
+            # update_race stops looping at the winner
+            positions[last, winner + 1:] = positions[last - 1, winner + 1:] if last > 0 else chunks[-1][-1, winner + 1:]
+            chunks.append(positions)
+            return np.concatenate(chunks), winner
+
+    # Convenience wrapper for a list of Horse objects and a Weather object
+    def estimate_field(self, horses, weather, trials=None):
+        speeds = [horse.stats["SPEED"] for horse in horses]
+        staminas = [horse.stats["STAMINA"] for horse in horses]
+        modifiers = [weather.get_performance_modifier(horse.weather_preference) for horse in horses]
+        return self.win_probabilities(speeds, staminas, modifiers, trials)
+
+
+if __name__ == "__main__":
+    import time
+    simulator = RaceSimulator(seed=0)
+    rng = np.random.default_rng()
+    speeds = rng.integers(30, 101, 5)
+    staminas = rng.integers(30, 101, 5)
+    modifiers = rng.choice([0.8, 1.0, 1.1], 5)
+    start = time.perf_counter()
+    probabilities = simulator.win_probabilities(speeds, staminas, modifiers)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    for speed, stamina, modifier, probability in zip(speeds, staminas, modifiers, probabilities):
+        print(f"SPEED {speed:3d}  STAMINA {stamina:3d}  WEATHER x{modifier:.1f}  ->  {probability * 100:5.1f}%")
+    print(f"{simulator.trials} races in {elapsed_ms:.1f} ms")
@@ -0,0 +1,135 @@
+import numpy as np
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.HorseStats import STAT_NAMES
+from core.RaceSimulator import (
+    SPEED_ROLL_MIN, SPEED_ROLL_MAX, SPEED_BONUS_DIVISOR, STAMINA_ROLL_DIVISOR, MOVE_SCALE, RACE_CHUNK_TICKS
+)
+
+# Column of each stat in RaceState.stats
+STAT_COLUMNS = {name: column for column, name in enumerate(STAT_NAMES)}
+SPEED_COLUMN = STAT_COLUMNS["SPEED"]
+STAMINA_COLUMN = STAT_COLUMNS["STAMINA"]
+
+
+# RaceState - structure-of-arrays state for a whole field.
+# Positions, stats, weather modifiers and animation frames live in NumPy arrays
+# (one slot per horse); Horse objects are thin views onto their slot. A race tick
+# is a handful of vector ops no matter how many horses are running.
+class RaceState:
+    def __init__(self, size, start_line_x, horse_sprite_width, seed=None):
+        self.size = size
+        self.start_line_x = start_line_x
+        self.horse_sprite_width = horse_sprite_width
+        self.exact_x = np.full(size, float(start_line_x))
+        # Position before the last tick (for interpolation) and where the sprite is drawn
+        self.previous_x = self.exact_x.copy()
+        self.draw_x = np.full(size, start_line_x, dtype=np.int64)
+        self.stats = np.zeros((size, len(STAT_NAMES)), dtype=np.int64)
+        # Bumped by set_stats, so a renderer can tell the stats changed without reading them
+        self.stats_version = 0
+        self.weather_modifiers = np.ones(size)
+        # Current animation frame, frames in the current animation, and when it last advanced
+        self.frame_index = np.zeros(size, dtype=np.int64)
+        self.frame_count = np.ones(size, dtype=np.int64)
+        self.last_frame_time = np.zeros(size, dtype=np.int64)
+        self.generator = np.random.default_rng(seed)
+        # Movement for the next ticks, rolled RACE_CHUNK_TICKS at a time
+        self.movements = None
+        self.movement_row = 0
+
+    # Seed the per-tick rolls (one seed per race keeps races reproducible)
+    def reseed(self, seed):
+        self.generator = np.random.default_rng(seed)
+        self.movements = None
+
+    # Write one slot's stats (dict of stat name -> value)
+    def set_stats(self, index, stats):
+        row = self.stats[index]
+        for name, value in stats.items():
+            row[STAT_COLUMNS[name]] = value
+        self.stats_version += 1
+
+    def set_weather_modifiers(self, modifiers):
+        self.weather_modifiers[:] = modifiers
+        self.movements = None
+
+    # Roll the movement of every horse for the next RACE_CHUNK_TICKS ticks in one go
+    def _roll_movements(self):
+        shape = (RACE_CHUNK_TICKS, self.size)
+        speed_rolls = self.generator.integers(SPEED_ROLL_MIN, SPEED_ROLL_MAX + 1, shape)
+        stamina_rolls = self.generator.integers(0, self.stats[:, STAMINA_COLUMN] // STAMINA_ROLL_DIVISOR + 1, shape)
+        rolls = speed_rolls + self.stats[:, SPEED_COLUMN] // SPEED_BONUS_DIVISOR + stamina_rolls
+        self.movements = rolls * self.weather_modifiers * MOVE_SCALE
+        self.movement_row = 0
+
+    # One race tick for every horse (same rules as Horse.move).
+    # Returns the index of the first horse (in field order) to reach finish_line_x, or None.
+    # Like the old per-horse loop, horses after the winner don't move on the winning tick.
+    # Stats and weather modifiers must not change mid-race (call reseed/set_weather_modifiers first).
+    def step(self, finish_line_x):
+        if self.movements is None or self.movement_row == RACE_CHUNK_TICKS:
+            self._roll_movements()
+        new_x = self.exact_x + self.movements[self.movement_row]
+        self.movement_row += 1
+
+        # int(x) + width >= finish  <=>  x >= finish - width (x is never negative)
+        finished = np.flatnonzero(new_x >= finish_line_x - self.horse_sprite_width)
+        if finished.size == 0:
+            self.previous_x, self.exact_x = self.exact_x, new_x
+            self.draw_x[:] = new_x
+            return None
+        winner = int(finished[0])
+        moved = winner + 1
+        self.previous_x[:moved] = self.exact_x[:moved]
+        self.exact_x[:moved] = new_x[:moved]
+        self.draw_x[:moved] = self.exact_x[:moved]
+        return winner
+
+    # Jump every horse to precomputed positions (race playback)
+    def set_positions(self, positions):
+        self.previous_x[:] = self.exact_x
+        self.exact_x[:] = positions
+        self.draw_x[:] = self.exact_x.astype(np.int64)
+
+    # Draw every horse between its last two ticks (alpha 0.0 - 1.0)
+    def interpolate(self, alpha):
+        self.draw_x[:] = (self.previous_x + (self.exact_x - self.previous_x) * alpha).astype(np.int64)
+
+    # Advance the animation of every horse (or one slot) whose frame is older than interval_ms
+    def update_animation(self, now, interval_ms, index=None):
+        if index is not None:
+            if now - self.last_frame_time[index] > interval_ms:
+                self.last_frame_time[index] = now
+                self.frame_index[index] = (self.frame_index[index] + 1) % self.frame_count[index]
+            return
+        due = now - self.last_frame_time > interval_ms
+        if not due.any():
+            return
+        self.last_frame_time[due] = now
+        self.frame_index[due] = (self.frame_index[due] + 1) % self.frame_count[due]
+
+    # Restart a slot's animation with a new number of frames
+    def set_animation(self, index, frame_count):
+        self.frame_index[index] = 0
+        self.frame_count[index] = max(1, frame_count)
+
+    # Put one slot (or everyone) back on the start line
+    def reset_positions(self, index=None):
+        target = slice(None) if index is None else index
+        self.exact_x[target] = float(self.start_line_x)
+        self.previous_x[target] = float(self.start_line_x)
+        self.draw_x[target] = self.start_line_x
+
+    def speeds(self):
+        return self.stats[:, SPEED_COLUMN]
+
+    def staminas(self):
+        return self.stats[:, STAMINA_COLUMN]
+
+    def __len__(self):
+        return self.size
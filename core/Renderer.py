@@ -1,9 +1,37 @@
 import pygame
 import math
+import sys
+import os
+from collections import OrderedDict
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.AssetManager import asset_manager
+from core.FrameProfiler import frame_profiler
+from core.HitIndex import HitIndex
+
+# Max number of rendered text surfaces kept around (least recently used are dropped)
+TEXT_CACHE_SIZE = 256
+# The track is drawn from tiles this wide, rendered on first sight and kept in an LRU cache
+# (a screen shows at most SCREEN_WIDTH / TRACK_TILE_WIDTH + 1 of them)
+TRACK_TILE_WIDTH = 400
+TRACK_TILE_CACHE_SIZE = 8
+# The camera keeps the leader this far from the left edge of the screen
+CAMERA_LEAD_X = 500
+# Button rects (x, y, w, h); they never move, so games without a Renderer
+# (e.g. GameServer sessions) can hit-test clicks against them too
+UI_RECTS = {
+    'play_button': (400, 480, 160, 80),
+    'bet_25': (30, 530, 35, 35),
+    'bet_50': (75, 530, 35, 35),
+    'bet_100': (120, 530, 35, 35),
+}
+ui_hit_index = HitIndex.from_dict(UI_RECTS)
 
 # Renderer class - handles all drawing
 class Renderer:
-    def __init__(self, screen, screen_width, race_height, ui_height):
+    def __init__(self, screen, screen_width, race_height, ui_height, dirty_rect_mode=False):
         self.screen = screen
         self.screen_width = screen_width
         self.race_height = race_height
@@ -25,6 +53,8 @@ class Renderer:
         self.BRIGHT_GREEN = (50, 255, 50)
         
         # Load fonts
+        if not pygame.font.get_init():
+            pygame.font.init()
         try:
             self.large_font = pygame.font.SysFont('Arial', 50)
             self.medium_font = pygame.font.SysFont('Arial', 24)
@@ -37,33 +67,88 @@ class Renderer:
             self.micro_font = pygame.font.Font(None, 18)
         
         # UI Element Rects
-        self.play_button_rect = pygame.Rect(400, 480, 160, 80)
-        self.bet_25_rect = pygame.Rect(30, 530, 35, 35)
-        self.bet_50_rect = pygame.Rect(75, 530, 35, 35)
-        self.bet_100_rect = pygame.Rect(120, 530, 35, 35)
+        self.play_button_rect = pygame.Rect(UI_RECTS['play_button'])
+        self.bet_25_rect = pygame.Rect(UI_RECTS['bet_25'])
+        self.bet_50_rect = pygame.Rect(UI_RECTS['bet_50'])
+        self.bet_100_rect = pygame.Rect(UI_RECTS['bet_100'])
         self.horse_img_rect = pygame.Rect(30, 425, 120, 90)
+        # Replay status, between the top texts and the lanes
+        self.replay_label_rect = pygame.Rect(250, 52, 300, 28)
+        # Click lookup over the widgets above
+        self.ui_hit_index = ui_hit_index
         
-        # Load coin icon
-        try:
-            import os
-            project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            coin_path = os.path.join(project_root, "Assets", "Coin.png")
-            self.coin_icon = pygame.image.load(coin_path).convert_alpha()
-            self.coin_icon = pygame.transform.scale(self.coin_icon, (30, 30))
-        except:
-            self.coin_icon = None
+        # Load coin icon (in the background, drawn once it's ready)
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        coin_path = os.path.join(project_root, "Assets", "Coin.png")
+        asset_manager.load_image("coin_icon", coin_path, alpha=True, size=(30, 30))
+
+        # Dirty-rect mode: only repaint (and report) the regions that changed
+        self.dirty_rect_mode = dirty_rect_mode
+        self.last_ui_state = None
+        self.drawn_horses = []  # (screen rect, image) of every horse as of the last frame
+        self.drawn_replay_label = None
+        self.drawn_camera_x = 0
+        self.race_rect = pygame.Rect(0, 0, screen_width, race_height)
+
+        # Track tiles keyed by tile index (tile i covers track x i * TRACK_TILE_WIDTH onwards)
+        self.track_tiles = OrderedDict()
+        self.track_tiles_key = None
+        self.track_tile_hits = 0
+        self.track_tile_misses = 0
+
+        # Rendered text surfaces keyed by (text, font, color, antialias)
+        self.text_cache = OrderedDict()
+        self.text_cache_hits = 0
+        self.text_cache_misses = 0
     
+    # Render text through the LRU cache (only rasterizes strings we haven't seen recently)
+    def render_text(self, text, font, color, antialias=True):
+        key = (text, font, color, antialias)
+        text_obj = self.text_cache.get(key)
+        if text_obj is None:
+            self.text_cache_misses += 1
+            text_obj = font.render(text, antialias, color)
+            self.text_cache[key] = text_obj
+            if len(self.text_cache) > TEXT_CACHE_SIZE:
+                self.text_cache.popitem(last=False)
+        else:
+            self.text_cache_hits += 1
+            self.text_cache.move_to_end(key)
+        return text_obj
+
+    # Hit/miss counters for the text cache
+    def get_text_cache_stats(self):
+        return {
+            "hits": self.text_cache_hits,
+            "misses": self.text_cache_misses,
+            "size": len(self.text_cache),
+        }
+
+    # Hit/miss counters for the track tile cache
+    def get_track_tile_stats(self):
+        return {
+            "hits": self.track_tile_hits,
+            "misses": self.track_tile_misses,
+            "size": len(self.track_tiles),
+        }
+
+    # Track x shown at the left edge of the screen: follows the leader, never past either end
+    def get_camera_x(self, game_manager):
+        leader_x = int(game_manager.race_state.draw_x.max())
+        return max(0, min(game_manager.track_width - self.screen_width, leader_x - CAMERA_LEAD_X))
+
     # Draw text with alignment
     def draw_text(self, text, font, color, x, y, align="topleft"):
-        text_obj = font.render(text, True, color)
-        text_rect = text_obj.get_rect()
-        if align == "topleft":
-            text_rect.topleft = (x, y)
-        elif align == "center":
-            text_rect.center = (x, y)
-        elif align == "midright":
-            text_rect.midright = (x, y)
-        self.screen.blit(text_obj, text_rect)
+        with frame_profiler.phase("text"):
+            text_obj = self.render_text(text, font, color)
+            text_rect = text_obj.get_rect()
+            if align == "topleft":
+                text_rect.topleft = (x, y)
+            elif align == "center":
+                text_rect.center = (x, y)
+            elif align == "midright":
+                text_rect.midright = (x, y)
+            self.screen.blit(text_obj, text_rect)
     
     # Draw stat bars for horses
     def draw_stat_bar(self, y, label, value):
@@ -74,9 +159,20 @@ class Renderer:
         pygame.draw.rect(self.screen, self.STAT_BAR_BG, bar_bg_rect)
         pygame.draw.rect(self.screen, self.STAT_BAR_FG, bar_fg_rect)
     
+    # Loading screen shown while the first-frame assets decode
+    def draw_loading_screen(self, finished, requested):
+        self.screen.fill(self.UI_BG)
+        center_x = self.screen_width // 2
+        center_y = (self.race_height + self.ui_height) // 2
+        self.draw_text("LOADING...", self.medium_font, self.WHITE, center_x, center_y - 30, align="center")
+        bar_rect = pygame.Rect(center_x - 150, center_y, 300, 20)
+        fill_width = int(bar_rect.width * (finished / requested)) if requested else bar_rect.width
+        pygame.draw.rect(self.screen, self.STAT_BAR_BG, bar_rect)
+        pygame.draw.rect(self.screen, self.GOLD, (bar_rect.x, bar_rect.y, fill_width, bar_rect.height))
+
     # Draw popup message
     def draw_popup(self, text):
-        text_surface = self.large_font.render(text, True, self.WHITE)
+        text_surface = self.render_text(text, self.large_font, self.WHITE)
         text_rect = text_surface.get_rect(center=(self.screen_width / 2, self.race_height / 2))
         s = pygame.Surface((text_rect.width + 40, text_rect.height + 40))
         s.set_alpha(200)
@@ -85,33 +181,190 @@ class Renderer:
         self.screen.blit(text_surface, text_rect)
     
     # Main draw function
+    # Returns None when the whole screen was drawn (use display.flip),
+    # or the list of changed rects in dirty-rect mode (use display.update)
     def draw_game_state(self, game_manager):
-        # Draw background
-        if game_manager.background:
-            self.screen.blit(game_manager.background, (0, 0))
+        if not self.dirty_rect_mode:
+            self._draw_full_frame(game_manager)
+            return None
+
+        ui_state = self._get_ui_state(game_manager)
+        camera_x = self.get_camera_x(game_manager)
+        sprites = self._get_horse_sprites(game_manager, camera_x)
+        if ui_state != self.last_ui_state:
+            # Something in the UI (or the field itself) changed: repaint everything once
+            self.last_ui_state = ui_state
+            self._draw_full_frame(game_manager, camera_x, sprites)
+            self._remember_horses(camera_x, sprites)
+            return [self.screen.get_rect()]
+
+        # Only horses (and the replay label) can change between UI updates,
+        # unless the camera moved, which scrolls the whole track
+        scrolled = camera_x != self.drawn_camera_x
+        dirty_rects = []
+        if scrolled:
+            dirty_rects.append(self.race_rect)
         else:
-            self.screen.fill(self.GREEN_TRACK)
-        
-        # Draw track lines
-        pygame.draw.line(self.screen, self.FINISH_LINE_COLOR, 
-                        (game_manager.finish_line_x, game_manager.track_top), 
-                        (game_manager.finish_line_x, game_manager.track_bottom), 5)
-        pygame.draw.line(self.screen, self.WHITE, 
-                        (game_manager.start_line_x, game_manager.track_top), 
-                        (game_manager.start_line_x, game_manager.track_bottom), 2)
+            for (old_rect, old_image), (new_rect, image) in zip(self.drawn_horses, sprites):
+                if new_rect != old_rect or image is not old_image:
+                    dirty_rects.append(old_rect.union(new_rect))
+        replay_label = self._get_replay_label(game_manager)
+        if replay_label != self.drawn_replay_label:
+            dirty_rects.append(self.replay_label_rect)
+        if not dirty_rects:
+            return []
+        # Popups sit on top of the track, so fall back to a full frame under them
+        if self._has_popup(game_manager):
+            self._draw_full_frame(game_manager, camera_x, sprites)
+            self._remember_horses(camera_x, sprites)
+            return [self.screen.get_rect()]
+
+        for rect in dirty_rects:
+            self.screen.set_clip(rect)
+            self._draw_race_area(game_manager, camera_x, sprites, rect)
+        self.screen.set_clip(None)
+        if scrolled:
+            self._draw_track_overlay(game_manager)
+        self._draw_replay_label(replay_label)
+        self._remember_horses(camera_x, sprites)
+        return dirty_rects
+
+    # Force a full repaint on the next frame (e.g. after something was drawn over the screen)
+    def invalidate(self):
+        self.last_ui_state = None
+
+    # Everything drawn on screen apart from the moving horses
+    def _get_ui_state(self, game_manager):
+        horse = game_manager.selected_horse
+        return (
+            tuple(id(h) for h in game_manager.horses), id(game_manager.background),
+            game_manager.game_state, game_manager.day, game_manager.weather.current_weather,
+            id(horse), horse.multiplier, horse.winrate_percent,
+            id(game_manager.race_state), game_manager.race_state.stats_version,
+            game_manager.selected_bet_pct, game_manager.wallet.cash, game_manager.wallet.debt,
+            game_manager.wallet.bet_amount, id(game_manager.winner), game_manager.game_over_message,
+            id(asset_manager.get("coin_icon")), game_manager.replay_player is not None
+        )
+
+    def _has_popup(self, game_manager):
+        if game_manager.replay_player:
+            return False
+        return (game_manager.game_state == "POST_RACE" and game_manager.winner) or game_manager.game_state == "GAME_OVER"
+
+    # e.g. "REPLAY 4x  3.2s / 5.1s", or None when no replay is playing
+    def _get_replay_label(self, game_manager):
+        player = game_manager.replay_player
+        if not player:
+            return None
+        seconds = int(player.tick) * player.tick_ms / 1000
+        total = player.last_tick * player.tick_ms / 1000
+        status = "PAUSED" if player.paused else f"{player.speed}x"
+        return f"REPLAY {status}  {seconds:.1f}s / {total:.1f}s"
+
+    # Opaque box, so drawing it again over itself needs no background repaint
+    def _draw_replay_label(self, label):
+        self.drawn_replay_label = label
+        if label is None:
+            return
+        pygame.draw.rect(self.screen, self.BLACK, self.replay_label_rect)
+        self.draw_text(label, self.small_font, self.WHITE,
+                      self.replay_label_rect.centerx, self.replay_label_rect.centery, align="center")
+
+    # (screen rect, image) of every horse, read straight from the RaceState arrays
+    # (one pass per frame instead of going through each Horse's properties)
+    def _get_horse_sprites(self, game_manager, camera_x):
+        race_state = game_manager.race_state
+        sprites = []
+        for horse, x, frame in zip(game_manager.horses, race_state.draw_x.tolist(), race_state.frame_index.tolist()):
+            frames = horse.current_animation_frames
+            image = frames[frame % len(frames)] if frames else horse.static_image
+            sprites.append((pygame.Rect(x - camera_x, horse.y, horse.width, horse.height), image))
+        return sprites
+
+    def _remember_horses(self, camera_x, sprites):
+        self.drawn_camera_x = camera_x
+        self.drawn_horses = sprites
+
+    # One tile of background with the track lines drawn on it, rendered once and then
+    # served from the cache until it falls out (or the background/lines change)
+    def _get_track_tile(self, game_manager, index):
+        key = (id(game_manager.background), game_manager.start_line_x, game_manager.finish_line_x,
+               game_manager.track_top, game_manager.track_bottom)
+        if self.track_tiles_key != key:
+            self.track_tiles_key = key
+            self.track_tiles.clear()
+        tile = self.track_tiles.get(index)
+        if tile is None:
+            self.track_tile_misses += 1
+            tile = self._render_track_tile(game_manager, index * TRACK_TILE_WIDTH)
+            self.track_tiles[index] = tile
+            if len(self.track_tiles) > TRACK_TILE_CACHE_SIZE:
+                self.track_tiles.popitem(last=False)
+        else:
+            self.track_tile_hits += 1
+            self.track_tiles.move_to_end(index)
+        return tile
+
+    def _render_track_tile(self, game_manager, tile_x):
+        tile = pygame.Surface((TRACK_TILE_WIDTH, self.race_height)).convert()
+        # Draw background (repeated every background width along the track)
+        background = game_manager.background
+        if background:
+            background_width = background.get_width()
+            offset = tile_x % background_width
+            tile.blit(background, (-offset, 0))
+            if offset + TRACK_TILE_WIDTH > background_width:
+                tile.blit(background, (background_width - offset, 0))
+        else:
+            tile.fill(self.GREEN_TRACK)
+
+        # Draw track lines (clipped to the tile, so a line on a tile edge lands on both tiles)
+        pygame.draw.line(tile, self.FINISH_LINE_COLOR, 
+                        (game_manager.finish_line_x - tile_x, game_manager.track_top), 
+                        (game_manager.finish_line_x - tile_x, game_manager.track_bottom), 5)
+        pygame.draw.line(tile, self.WHITE, 
+                        (game_manager.start_line_x - tile_x, game_manager.track_top), 
+                        (game_manager.start_line_x - tile_x, game_manager.track_bottom), 2)
+        return tile
+
+    # Draw track and horses in view of the camera (optionally only inside area).
+    # Only the tiles and horses on screen are touched, so the cost doesn't grow with the track
+    def _draw_race_area(self, game_manager, camera_x, sprites, area=None):
+        area = area or self.race_rect
+        with frame_profiler.phase("background"):
+            first_tile = (camera_x + area.left) // TRACK_TILE_WIDTH
+            last_tile = (camera_x + min(area.right, self.screen_width) - 1) // TRACK_TILE_WIDTH
+            for index in range(first_tile, last_tile + 1):
+                tile_x = index * TRACK_TILE_WIDTH - camera_x
+                tile = self._get_track_tile(game_manager, index)
+                # Only the part of the tile inside area
+                source = area.clip(tile_x, 0, TRACK_TILE_WIDTH, self.race_height)
+                self.screen.blit(tile, source.topleft, source.move(-tile_x, 0))
         
         # Draw horses
-        for horse in game_manager.horses:
-            horse.draw(self.screen)
-        
+        with frame_profiler.phase("horses"):
+            for rect, image in sprites:
+                if area.colliderect(rect):
+                    self.screen.blit(image, rect)
+
+    def _draw_full_frame(self, game_manager, camera_x=None, sprites=None):
+        if camera_x is None:
+            camera_x = self.get_camera_x(game_manager)
+        if sprites is None:
+            sprites = self._get_horse_sprites(game_manager, camera_x)
+        self._draw_race_area(game_manager, camera_x, sprites)
+        with frame_profiler.phase("ui"):
+            self._draw_ui_panel(game_manager)
+            self._draw_replay_label(self._get_replay_label(game_manager))
+
+    # Bottom panel, top texts and popups
+    def _draw_ui_panel(self, game_manager):
         # Draw UI panel
         pygame.draw.rect(self.screen, self.UI_BG, (0, self.race_height, self.screen_width, self.ui_height))
-        pygame.draw.line(self.screen, self.UI_DIVIDER, (0, self.race_height), (self.screen_width, self.race_height), 3)
         
         # Preview image
-        preview_image = game_manager.selected_horse.get_preview_image()
-        scaled_preview = pygame.transform.scale(preview_image, self.horse_img_rect.size)
-        self.screen.blit(scaled_preview, self.horse_img_rect.topleft)
+        preview_image = game_manager.selected_horse.get_preview_image(self.horse_img_rect.size)
+        self.screen.blit(preview_image, self.horse_img_rect.topleft)
         
         self.draw_text(game_manager.selected_horse.name, self.small_font, self.WHITE, 
                       self.horse_img_rect.centerx, 418, align="center")
@@ -122,17 +375,13 @@ class Renderer:
         self._draw_bet_buttons(game_manager.selected_bet_pct)
         
         # Stats
-        self.draw_stat_bar(430, "SPEED", game_manager.selected_horse.stats["SPEED"])
-        self.draw_stat_bar(455, "STAMINA", game_manager.selected_horse.stats["STAMINA"])
-        self.draw_stat_bar(480, "WIT", game_manager.selected_horse.stats["WIT"])
+        stats = game_manager.selected_horse.stats
+        self.draw_stat_bar(430, "SPEED", stats["SPEED"])
+        self.draw_stat_bar(455, "STAMINA", stats["STAMINA"])
+        self.draw_stat_bar(480, "WIT", stats["WIT"])
         
-        # Top UI
-        self.draw_text("OBJECTIVE: Finish your debt by the end of the month.", self.micro_font, self.WHITE, 
-                      self.screen_width // 2, 10, align="center")
-        self.draw_text(f"DEBT: {game_manager.wallet.debt:,.0f}", self.small_font, self.RED, 
-                      self.screen_width // 2, 30, align="center")
-        self.draw_text(f"DAY: {game_manager.day} / {game_manager.day_limit}", self.small_font, self.WHITE, 
-                      self.screen_width - 10, 10, align="midright")
+        # Divider and top UI
+        self._draw_track_overlay(game_manager)
         
         # Horse info
         self.draw_text(f"CHANCES: {game_manager.selected_horse.winrate_percent:.0f}%", 
@@ -143,8 +392,9 @@ class Renderer:
                       self.micro_font, self.WHITE, 590, 480) #x, y position
         
         # Cash display with coin icon
-        if self.coin_icon:
-            self.screen.blit(self.coin_icon, (590, 515)) #x, y position
+        coin_icon = asset_manager.get("coin_icon")
+        if coin_icon:
+            self.screen.blit(coin_icon, (590, 515)) #x, y position
         self.draw_text(f"CASH: {game_manager.wallet.cash:,.0f}", self.medium_font, self.WHITE, 
                       770, 530, align="midright")
         
@@ -159,12 +409,24 @@ class Renderer:
         # Play button
         self._draw_play_button(game_manager.game_state)
         
-        # Popups
-        if game_manager.game_state == "POST_RACE" and game_manager.winner:
+        # Popups (hidden while the replay plays, they'd cover the track)
+        if game_manager.replay_player:
+            pass
+        elif game_manager.game_state == "POST_RACE" and game_manager.winner:
             self.draw_popup(f"{game_manager.winner.name} Wins!")
         elif game_manager.game_state == "GAME_OVER":
             self.draw_popup(game_manager.game_over_message)
     
+    # Everything the UI draws over the track (repainted whenever the track scrolls under it)
+    def _draw_track_overlay(self, game_manager):
+        pygame.draw.line(self.screen, self.UI_DIVIDER, (0, self.race_height), (self.screen_width, self.race_height), 3)
+        self.draw_text("OBJECTIVE: Finish your debt by the end of the month.", self.micro_font, self.WHITE, 
+                      self.screen_width // 2, 10, align="center")
+        self.draw_text(f"DEBT: {game_manager.wallet.debt:,.0f}", self.small_font, self.RED, 
+                      self.screen_width // 2, 30, align="center")
+        self.draw_text(f"DAY: {game_manager.day} / {game_manager.day_limit}", self.small_font, self.WHITE, 
+                      self.screen_width - 10, 10, align="midright")
+
     # Draw betting buttons
     def _draw_bet_buttons(self, selected_bet_pct):
         pygame.draw.rect(self.screen, self.GOLD_DARK if selected_bet_pct == 25 else self.GOLD, self.bet_25_rect)
@@ -0,0 +1,193 @@
+import struct
+import zlib
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.HorseStats import STAT_NAMES
+
+# File layout: magic, format version, payload, CRC32 of everything before it.
+# Bump SAVE_VERSION whenever the payload layout changes.
+SAVE_MAGIC = b"CHSV"
+SAVE_VERSION = 2
+GAME_STATES = ["BETTING", "RACING", "POST_RACE", "GAME_OVER"]
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_HEADER = struct.Struct("<4sH")
+_CAMPAIGN = struct.Struct("<HB")
+_WALLET = struct.Struct("<qqqqqB")
+# Selected and winner index (-1 = none) and horse count, wide enough for any field size
+_FIELD = struct.Struct("<iiI")
+_RNG = struct.Struct("<B625IBd")
+_HORSE = struct.Struct("<hddd3B%dB" % len(STAT_NAMES))
+_COUNT = struct.Struct("<B")
+_CRC = struct.Struct("<I")
+
+# Autosaves are written on this thread so the frame never waits for the disk
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="save")
+
+
+class SaveError(Exception):
+    pass
+
+
+class _Writer:
+    def __init__(self):
+        self.parts = []
+
+    def pack(self, fmt, *values):
+        self.parts.append(fmt.pack(*values))
+
+    def string(self, text):
+        data = text.encode("utf-8")
+        self.parts.append(struct.pack("<H", len(data)) + data)
+
+    def getvalue(self):
+        return b"".join(self.parts)
+
+
+class _Reader:
+    def __init__(self, data, offset=0):
+        self.data = data
+        self.offset = offset
+
+    def unpack(self, fmt):
+        values = fmt.unpack_from(self.data, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def string(self):
+        (length,) = struct.unpack_from("<H", self.data, self.offset)
+        self.offset += 2
+        text = self.data[self.offset:self.offset + length].decode("utf-8")
+        self.offset += length
+        return text
+
+
+# Asset paths are stored relative to the project so saves survive moving the install
+def _relative(path):
+    return os.path.relpath(path, PROJECT_ROOT).replace(os.sep, "/")
+
+
+def _absolute(path):
+    return os.path.join(PROJECT_ROOT, *path.split("/"))
+
+
+# Campaign state dict (see GameManager.get_save_state) -> bytes
+def encode_state(state):
+    writer = _Writer()
+    writer.pack(_HEADER, SAVE_MAGIC, SAVE_VERSION)
+    # Seeds only ever get formatted into day seeds, so their text form is exact
+    writer.string(str(state["session_seed"]))
+    writer.pack(_CAMPAIGN, state["day"], GAME_STATES.index(state["game_state"]))
+    writer.string(state["game_over_message"])
+    writer.pack(_WALLET, state["cash"], state["debt"], state["original_debt"], state["starting_cash"],
+                state["bet_amount"], state["selected_bet_pct"])
+    writer.string(state["weather"])
+
+    version, internal_state, gauss_next = state["rng_state"]
+    writer.pack(_RNG, version, *internal_state, gauss_next is not None, gauss_next or 0.0)
+
+    horses = state["horses"]
+    writer.pack(_FIELD, state["selected_index"], state["winner_index"], len(horses))
+    for horse in horses:
+        writer.string(horse["name"])
+        writer.string(horse["weather_preference"])
+        writer.string(_relative(horse["idle_strip_path"]))
+        writer.string(_relative(horse["run_strip_path"]))
+        appearance = horse["appearance"] or ()
+        writer.pack(_COUNT, len(appearance))
+        for layer in appearance:
+            writer.string(_relative(layer) if layer else "")
+        writer.pack(_HORSE, horse["y"], horse["exact_x"], horse["multiplier"], horse["winrate_percent"],
+                    *horse["color_fallback"], *(horse["stats"][name] for name in STAT_NAMES))
+
+    payload = writer.getvalue()
+    return payload + _CRC.pack(zlib.crc32(payload))
+
+
+# bytes -> campaign state dict; raises SaveError if the file is damaged or from another version
+def decode_state(data):
+    if len(data) < _HEADER.size + _CRC.size:
+        raise SaveError("save file is truncated")
+    payload, (crc,) = data[:-_CRC.size], _CRC.unpack_from(data, len(data) - _CRC.size)
+    if zlib.crc32(payload) != crc:
+        raise SaveError("save file is corrupt (checksum mismatch)")
+    reader = _Reader(payload)
+    magic, version = reader.unpack(_HEADER)
+    if magic != SAVE_MAGIC:
+        raise SaveError("not a save file")
+    if version != SAVE_VERSION:
+        raise SaveError(f"unsupported save version {version}")
+
+    state = {}
+    session_seed = reader.string()
+    state["session_seed"] = int(session_seed) if session_seed.lstrip("-").isdigit() else session_seed
+    state["day"], game_state = reader.unpack(_CAMPAIGN)
+    state["game_state"] = GAME_STATES[game_state]
+    state["game_over_message"] = reader.string()
+    (state["cash"], state["debt"], state["original_debt"], state["starting_cash"],
+     state["bet_amount"], state["selected_bet_pct"]) = reader.unpack(_WALLET)
+    state["weather"] = reader.string()
+
+    rng = reader.unpack(_RNG)
+    state["rng_state"] = (rng[0], tuple(rng[1:626]), rng[627] if rng[626] else None)
+
+    state["selected_index"], state["winner_index"], count = reader.unpack(_FIELD)
+    horses = []
+    for _ in range(count):
+        horse = {"name": reader.string(), "weather_preference": reader.string()}
+        horse["idle_strip_path"] = _absolute(reader.string())
+        horse["run_strip_path"] = _absolute(reader.string())
+        (layers,) = reader.unpack(_COUNT)
+        appearance = tuple(_absolute(layer) if layer else None for layer in (reader.string() for _ in range(layers)))
+        horse["appearance"] = appearance or None
+        values = reader.unpack(_HORSE)
+        horse["y"], horse["exact_x"], horse["multiplier"], horse["winrate_percent"] = values[:4]
+        horse["color_fallback"] = values[4:7]
+        horse["stats"] = dict(zip(STAT_NAMES, values[7:]))
+        horses.append(horse)
+    state["horses"] = horses
+    return state
+
+
+# Write bytes so that path always holds either the old or the new file, never half of one
+def write_atomic(path, data):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as save_file:
+        save_file.write(data)
+        save_file.flush()
+        os.fsync(save_file.fileno())
+    os.replace(temp_path, path)
+
+
+def save_campaign(game_manager, path):
+    write_atomic(path, encode_state(game_manager.get_save_state()))
+
+
+# Snapshot now (cheap) and write on the save thread; returns a Future
+def save_campaign_async(game_manager, path):
+    data = encode_state(game_manager.get_save_state())
+    return _writer.submit(_write_logged, path, data)
+
+
+def _write_logged(path, data):
+    try:
+        write_atomic(path, data)
+    except OSError as e:
+        print(f"Warning: Could not save campaign to {path}: {e}")
+
+
+# Block until queued autosaves are on disk (call before exiting)
+def flush_saves():
+    _writer.submit(lambda: None).result()
+
+
+def load_campaign(path):
+    with open(path, "rb") as save_file:
+        return decode_state(save_file.read())
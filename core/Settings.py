@@ -0,0 +1,38 @@
+# Game rules and track layout shared by the game and the headless tools.
+# No pygame here, so simulators and scripts can import it cheaply.
+
+#  Screen Settings 
+SCREEN_WIDTH = 800
+RACE_HEIGHT = 400
+UI_HEIGHT = 200
+SCREEN_HEIGHT = RACE_HEIGHT + UI_HEIGHT
+
+#  Track Settings 
+# Race distance in screens; longer tracks scroll with the leader.
+# The odds table is built per distance: run python -m core.OddsTable after changing it
+# (otherwise the game builds and caches it in the background on first launch)
+RACE_SCREENS = 1
+TRACK_WIDTH = SCREEN_WIDTH * RACE_SCREENS
+
+#  Game Constants 
+START_LINE_X = 40
+FINISH_LINE_X = TRACK_WIDTH - 80 #yellow line thing
+# Cheesy fix: logic line is further back so horse fully crosses visual line
+FINISH_LINE_OVERSHOOT = 50
+HORSE_SPRITE_WIDTH = 64 
+HORSE_SPRITE_HEIGHT = 48
+STARTING_CASH = 5000 #(Maybe randomize later?) (nope)
+DEBT_TO_PAY = 10000 #how much debt to pay (should I randomize this...?) (nah)
+DAY_LIMIT = 30 # Days to pay debt 
+BET_PERCENTAGES = [25, 50, 100] # Bet buttons
+MIN_HORSES = 3 # Horses per race
+MAX_HORSES = 5
+
+#Weather Types 
+WEATHER_TYPES = ["Sunny", "Rainy"]
+
+# Horse Names 
+HORSE_NAMES = [
+    "Frankfurt","Mejiro","Seabiscuit", "Black Death", "Senomy", "Nearly There",
+    "Thunderbolt", "Shadowfax", "Windrunner", "Stormchaser"
+] 
@@ -0,0 +1,139 @@
+import pygame
+import struct
+import time
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.AssetManager import asset_manager
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Decoded PCM of every sound effect (rebuilt when a source file or the mixer format changes)
+SOUND_CACHE_DIR = os.path.join(PROJECT_ROOT, "sound_cache")
+# Mixer channels reserved per group; a group with every channel busy steals its oldest voice
+CHANNEL_GROUPS = {"gallop": 1, "ui": 4, "result": 2}
+
+SOUND_CACHE_MAGIC = b"CHPC"
+SOUND_CACHE_VERSION = 1
+# magic, version, mixer frequency, format and channels, source file size and mtime
+_HEADER = struct.Struct("<4sHihBqq")
+
+
+def _cache_header(path):
+    frequency, sample_format, channels = pygame.mixer.get_init()
+    stat = os.stat(path)
+    return _HEADER.pack(SOUND_CACHE_MAGIC, SOUND_CACHE_VERSION, frequency, sample_format, channels,
+                        stat.st_size, stat.st_mtime_ns)
+
+
+# Sound from the PCM cache; on a miss the source file is decoded and cached for the next launch.
+# Runs on an asset loader thread (the mixer must already be initialized).
+def load_cached_sound(path, cache_dir=SOUND_CACHE_DIR):
+    header = _cache_header(path)
+    cache_path = os.path.join(cache_dir, os.path.basename(path) + ".pcm")
+    try:
+        with open(cache_path, "rb") as cache_file:
+            data = cache_file.read()
+        if data[:_HEADER.size] == header:
+            return pygame.mixer.Sound(buffer=memoryview(data)[_HEADER.size:])
+    except OSError:
+        pass
+
+    sound = pygame.mixer.Sound(path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_path = cache_path + ".tmp"
+        with open(temp_path, "wb") as cache_file:
+            cache_file.write(header)
+            cache_file.write(sound.get_raw())
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: Could not cache sound {path}: {e}")
+    return sound
+
+
+# SoundBank - every sound effect of the process, decoded once, plus the mixer channels they play on.
+# Sounds load through the asset loader (a few ms per file from the PCM cache instead of
+# decoding MP3s on every launch) and stay loaded across game resets. Each sound belongs to a
+# channel group (gallop loop, UI clicks, result stings) with its own reserved channels, so a
+# burst of clicks can never starve the gallop loop or a result sting; when every channel of a
+# group is busy, the voice that started first is cut off for the new one.
+class SoundBank:
+    def __init__(self, channel_groups=CHANNEL_GROUPS, cache_dir=SOUND_CACHE_DIR):
+        self.channel_groups = channel_groups
+        self.cache_dir = cache_dir
+        self.keys = {}        # sound name -> asset key
+        self.groups = {}      # sound name -> channel group
+        self.channels = None  # channel group -> [Channel]
+        self.started = {}     # channel group -> when each of its channels started its sound
+        self.music_path = None
+
+    # Queue sounds (name -> (path, channel group)); files already loaded in this process are skipped.
+    # The mixer must already be initialized.
+    def load(self, sounds):
+        if self.channels is None:
+            self._reserve_channels()
+        for name, (path, group) in sounds.items():
+            key = ("sound", os.path.basename(path))
+            self.keys[name] = key
+            self.groups[name] = group
+            asset_manager.load(key, lambda path=path: load_cached_sound(path, self.cache_dir))
+
+    # Take the first channels out of pygame's automatic pool and split them between the groups
+    def _reserve_channels(self):
+        total = sum(self.channel_groups.values())
+        if pygame.mixer.get_num_channels() <= total:
+            pygame.mixer.set_num_channels(total + 1)
+        pygame.mixer.set_reserved(total)
+        self.channels = {}
+        first = 0
+        for group, count in self.channel_groups.items():
+            self.channels[group] = [pygame.mixer.Channel(first + i) for i in range(count)]
+            self.started[group] = [0.0] * count
+            first += count
+
+    def is_loaded(self, name):
+        return asset_manager.get(self.keys.get(name)) is not None
+
+    # Play a sound on its group's channels (loops=-1 repeats until stopped).
+    # Returns the Channel, or None if the sound isn't loaded (yet) or there is no mixer.
+    def play(self, name, loops=0):
+        sound = asset_manager.get(self.keys.get(name))
+        if sound is None or self.channels is None or not pygame.mixer.get_init():
+            return None
+        group = self.groups[name]
+        channels = self.channels[group]
+        started = self.started[group]
+        index = next((i for i, channel in enumerate(channels) if not channel.get_busy()), None)
+        if index is None:
+            # Voice stealing: the oldest voice in the group makes room
+            index = started.index(min(started))
+        channels[index].play(sound, loops)
+        started[index] = time.monotonic()
+        return channels[index]
+
+    # Silence every channel of a group (e.g. the gallop loop when the race ends)
+    def stop_group(self, group):
+        if self.channels is None or not pygame.mixer.get_init():
+            return
+        for channel in self.channels[group]:
+            channel.stop()
+
+    # Stream background music on loop; already playing the same file is a no-op, so a
+    # game reset doesn't reload it or restart it from the top
+    def play_music(self, path, volume):
+        if self.music_path == path and pygame.mixer.music.get_busy():
+            return
+        try:
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.set_volume(volume)
+            pygame.mixer.music.play(-1)
+            self.music_path = path
+        except Exception as e:
+            asset_manager.record_failure(("music", os.path.basename(path)), e)
+
+
+# Shared instance used by the game
+sound_bank = SoundBank()
@@ -0,0 +1,36 @@
+import random
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.Settings import WEATHER_TYPES
+
+# Speed modifiers a horse can get from the weather
+PREFERRED_MODIFIER = 1.1  # 10% boost in preferred weather
+OPPOSITE_MODIFIER = 0.8   # 20% penalty in opposite conditions
+NEUTRAL_MODIFIER = 1.0
+PERFORMANCE_MODIFIERS = (OPPOSITE_MODIFIER, NEUTRAL_MODIFIER, PREFERRED_MODIFIER)
+
+# Weather class - handles weather effects on horse speed
+class Weather:
+    def __init__(self, rng=None):
+        # Any random.Random-like object (defaults to the global random module)
+        self.rng = rng or random
+        self.current_weather = self.rng.choice(WEATHER_TYPES)
+    
+    # Randomize weather for next race
+    def change_weather(self, rng=None):
+        if rng:
+            self.rng = rng
+        self.current_weather = self.rng.choice(WEATHER_TYPES)
+    
+    # Returns speed boost/penalty based on weather match
+    def get_performance_modifier(self, horse_weather_preference):
+        if self.current_weather == horse_weather_preference:
+            return PREFERRED_MODIFIER
+        elif self.current_weather in ["Rainy"] and horse_weather_preference in ["Sunny"]:
+            return OPPOSITE_MODIFIER
+        else:
+            return NEUTRAL_MODIFIER
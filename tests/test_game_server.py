@@ -0,0 +1,60 @@
+import asyncio
+import json
+import sys
+import os
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.GameServer import GameServer, decode_message
+
+
+@pytest.mark.parametrize("line", [
+    b'{"type":"click"}',
+    b'{"type":"click","pos":"ab"}',
+    b'{"type":"click","pos":[1]}',
+    b'{"type":"click","pos":[1.5,2]}',
+    b'[1,2]',
+    b'"click"',
+    b'not json',
+])
+def test_decode_message_rejects_malformed(line):
+    with pytest.raises(ValueError):
+        decode_message(line)
+
+
+def test_decode_message_accepts_click():
+    assert decode_message(b'{"type":"click","pos":[10,20]}') == {"type": "click", "pos": [10, 20]}
+
+
+async def _read_message(reader, message_type):
+    while True:
+        message = json.loads(await asyncio.wait_for(reader.readline(), 10))
+        if message["type"] == message_type:
+            return message
+
+
+def test_malformed_message_keeps_session_connected():
+    async def run():
+        server = GameServer(port=0, seed=1)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection(server.host, server.port)
+            await _read_message(reader, "state")
+            for line in (b'{"type":"click"}', b'[1,2]', b'{"type":"click","pos":null}'):
+                writer.write(line + b"\n")
+            writer.write(b'{"type":"metrics"}\n')
+            await writer.drain()
+            metrics = await _read_message(reader, "metrics")
+            writer.close()
+            return metrics
+        finally:
+            await server.stop()
+
+    metrics = asyncio.run(run())
+    assert metrics["sessions"] == 1
@@ -0,0 +1,43 @@
+import sys
+import os
+
+import numpy as np
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.RaceReplay import RaceReplay, ReplayError, encode_replay, decode_replay
+
+
+def _replay(horse_count, tick_count=50, winner_index=0, seed=1):
+    rng = np.random.default_rng(seed)
+    positions = 40 + np.cumsum(rng.integers(0, 4, size=(tick_count, horse_count)), axis=0)
+    frames = np.cumsum(rng.integers(0, 2, size=(tick_count, horse_count)), axis=0) % 8
+    return RaceReplay(positions, frames, winner_index)
+
+
+def test_round_trip():
+    replay = _replay(horse_count=5, winner_index=3)
+    decoded = decode_replay(encode_replay(replay))
+    assert decoded.tick_count == replay.tick_count
+    assert decoded.winner_index == 3
+    np.testing.assert_array_equal(decoded.positions, replay.positions)
+    np.testing.assert_array_equal(decoded.frames, replay.frames)
+
+
+def test_damaged_replay_is_rejected():
+    data = encode_replay(_replay(horse_count=5))
+    with pytest.raises(ReplayError):
+        decode_replay(data[:-8])
+    with pytest.raises(ReplayError):
+        decode_replay(b"XXXX" + data[4:])
+
+
+def test_field_larger_than_a_signed_byte_round_trips():
+    replay = _replay(horse_count=300, winner_index=250)
+    decoded = decode_replay(encode_replay(replay))
+    assert decoded.horse_count == 300
+    assert decoded.winner_index == 250
+    np.testing.assert_array_equal(decoded.positions, replay.positions)
+    np.testing.assert_array_equal(decoded.frames, replay.frames)
@@ -0,0 +1,37 @@
+import sys
+import os
+
+import numpy as np
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.RaceSimulator import RaceSimulator
+
+SPEEDS = [45, 80, 62, 99]
+STAMINAS = [90, 40, 66, 33]
+MODIFIERS = [1.0, 0.8, 1.2, 1.0]
+
+
+def test_simulate_race_is_deterministic_for_a_seed():
+    simulator = RaceSimulator()
+    positions, winner = simulator.simulate_race(SPEEDS, STAMINAS, MODIFIERS, seed=42)
+    again, again_winner = RaceSimulator().simulate_race(SPEEDS, STAMINAS, MODIFIERS, seed=42)
+    np.testing.assert_array_equal(positions, again)
+    assert winner == again_winner
+    other, _ = simulator.simulate_race(SPEEDS, STAMINAS, MODIFIERS, seed=43)
+    assert positions.shape != other.shape or not np.array_equal(positions, other)
+
+
+def test_simulate_winners_is_deterministic_for_a_seed():
+    first = RaceSimulator(seed=7).simulate_winners(SPEEDS, STAMINAS, MODIFIERS, trials=500)
+    second = RaceSimulator(seed=7).simulate_winners(SPEEDS, STAMINAS, MODIFIERS, trials=500)
+    np.testing.assert_array_equal(first, second)
+
+
+def test_sampled_win_rates_match_exact_probabilities():
+    simulator = RaceSimulator(seed=1)
+    exact = simulator.exact_win_probabilities(SPEEDS, STAMINAS, MODIFIERS)
+    sampled = simulator.win_probabilities(SPEEDS, STAMINAS, MODIFIERS, trials=20000)
+    assert abs(exact.sum() - 1.0) < 1e-9
+    np.testing.assert_allclose(sampled, exact, atol=0.02)
@@ -0,0 +1,69 @@
+import random
+import sys
+import os
+
+import pytest
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.SaveGame import encode_state, decode_state, SaveError, PROJECT_ROOT
+
+
+def _horse(i):
+    return {
+        "name": f"Horse {i}",
+        "weather_preference": "Sunny",
+        "idle_strip_path": os.path.join(PROJECT_ROOT, "Assets", "horses_idle_right_brown.png"),
+        "run_strip_path": os.path.join(PROJECT_ROOT, "Assets", "horses_run_right_brown.png"),
+        "appearance": None,
+        "y": 100 + i,
+        "exact_x": 40.0,
+        "multiplier": 1.25,
+        "winrate_percent": 42.5,
+        "color_fallback": (120, 130, 140),
+        "stats": {"SPEED": 50, "STAMINA": 60, "WIT": 70},
+    }
+
+
+def _state(horse_count=5, selected_index=0, winner_index=-1):
+    return {
+        "session_seed": 1234,
+        "day": 3,
+        "game_state": "BETTING",
+        "game_over_message": "",
+        "cash": 2500,
+        "debt": 7500,
+        "original_debt": 10000,
+        "starting_cash": 2000,
+        "bet_amount": 0,
+        "selected_bet_pct": 25,
+        "weather": "Rainy",
+        "rng_state": random.Random(1).getstate(),
+        "selected_index": selected_index,
+        "winner_index": winner_index,
+        "horses": [_horse(i) for i in range(horse_count)],
+    }
+
+
+def test_round_trip():
+    state = _state(winner_index=2)
+    state["horses"][1]["appearance"] = (os.path.join(PROJECT_ROOT, "Assets", "horses_run_right_black.png"), None)
+    assert decode_state(encode_state(state)) == state
+
+
+def test_corrupted_byte_fails_the_checksum():
+    data = bytearray(encode_state(_state()))
+    data[len(data) // 2] ^= 0xFF
+    with pytest.raises(SaveError, match="checksum"):
+        decode_state(bytes(data))
+
+
+def test_truncated_file_is_rejected():
+    with pytest.raises(SaveError):
+        decode_state(encode_state(_state())[:-10])
+
+
+def test_field_larger_than_a_signed_byte_round_trips():
+    state = _state(horse_count=300, selected_index=250, winner_index=299)
+    assert decode_state(encode_state(state)) == state